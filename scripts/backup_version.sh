@@ -62,3 +62,6 @@ echo "Image: $BACKUP_PNG"
 echo ""
 echo "To compare with previous version:"
 echo "  open $BACKUP_DIR/${TEMPLATE_BASENAME}_v$(printf "%02d" $((NEXT_NUM - 1))).png $BACKUP_PNG"
+echo ""
+echo "To see what changed:"
+echo "  python3 scripts/diff_versions.py $BACKUP_DIR/${TEMPLATE_BASENAME}_v$(printf "%02d" $((10#$NEXT_NUM - 1))).png $BACKUP_PNG"
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+remove_text.py の自動検出（auto_detect_text_regions）のベンチマーク
+
+変更前の実装（処理ごとに配列を生成し、膨張を繰り返し、除外領域を
+マスク画像で適用する）と現在の実装を同じ入力で実行し、
+出力マスクが完全に一致することを確認したうえで、
+処理時間（中央値）とピークメモリ（tracemalloc）を比較します。
+
+使用例:
+    # 合成した名刺画像（300 DPI 相当）で比較
+    python scripts/bench_remove_text.py
+
+    # 600 DPI 相当の大きさで比較
+    python scripts/bench_remove_text.py --scale 2
+
+    # 実際の画像と除外領域で比較
+    python scripts/bench_remove_text.py --image input/card.png \
+        --exclude 0,0,0.35,0.15 --exclude 0,0.65,0.35,1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from remove_text import auto_detect_text_regions, create_region_mask, parse_region  # noqa: E402
+
+# 名刺サイズ（300 DPI）
+CARD_SIZE = (1075, 650)
+
+
+def legacy_auto_detect_text_regions(
+    img: np.ndarray,
+    exclude_regions: list[tuple[float, float, float, float]] | None = None,
+    bg_threshold: int = 230,
+    text_threshold: int = 200,
+    dilate_iterations: int = 3,
+) -> np.ndarray:
+    """変更前の auto_detect_text_regions（比較用）"""
+    h, w = img.shape[:2]
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    _, white_region = cv2.threshold(gray, bg_threshold, 255, cv2.THRESH_BINARY)
+
+    kernel_bg = np.ones((10, 10), dtype=np.uint8)
+    white_region_expanded = cv2.dilate(white_region, kernel_bg, iterations=2)
+
+    _, dark_pixels = cv2.threshold(gray, text_threshold, 255, cv2.THRESH_BINARY_INV)
+
+    text_mask = cv2.bitwise_and(dark_pixels, white_region_expanded)
+
+    if exclude_regions:
+        exclude_mask = create_region_mask((h, w), exclude_regions)
+        exclude_mask_inv = cv2.bitwise_not(exclude_mask)
+        text_mask = cv2.bitwise_and(text_mask, exclude_mask_inv)
+
+    if dilate_iterations > 0:
+        kernel = np.ones((3, 3), dtype=np.uint8)
+        text_mask = cv2.dilate(text_mask, kernel, iterations=dilate_iterations)
+
+    return text_mask
+
+
+def synthesize_card(scale: float) -> np.ndarray:
+    """白背景にロゴ風の色面とテキストを描いた名刺画像を生成"""
+    w, h = (round(v * scale) for v in CARD_SIZE)
+    img = np.full((h, w, 3), 255, dtype=np.uint8)
+    cv2.rectangle(img, (0, 0), (int(w * 0.3), h), (120, 60, 20), -1)
+    cv2.circle(img, (int(w * 0.15), int(h * 0.2)), int(h * 0.1), (255, 255, 255), -1)
+
+    lines = ["Acme Corporation", "Taro Yamada", "Senior Engineer", "TEL 03-1234-5678"]
+    for i, text in enumerate(lines):
+        cv2.putText(
+            img,
+            text,
+            (int(w * 0.35), int(h * (0.2 + i * 0.2))),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2 * scale,
+            (40, 40, 40),
+            max(1, round(2 * scale)),
+            cv2.LINE_AA,
+        )
+    return img
+
+
+def measure(func, img, kwargs, repeat: int) -> tuple[np.ndarray, float, int]:
+    """
+    関数を repeat 回実行し、(出力, 処理時間の中央値 [秒], ピークメモリ [バイト]) を返す
+    """
+    func(img, **kwargs)  # ウォームアップ
+
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(img, **kwargs)
+        times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = func(img, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, statistics.median(times), peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="auto_detect_text_regions の変更前後の処理時間とピークメモリを比較"
+    )
+    parser.add_argument("--image", type=Path, help="入力画像（省略時は合成画像）")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="合成画像の倍率（1 = 300 DPI の名刺、デフォルト: 1）",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        dest="excludes",
+        metavar="x1,y1,x2,y2",
+        help="除外領域（割合: 0.0-1.0）。省略時は左側の色面を除外",
+    )
+    parser.add_argument(
+        "--dilate", type=int, default=3, help="マスク膨張回数（デフォルト: 3）"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="計測の繰り返し回数（デフォルト: 20）"
+    )
+    args = parser.parse_args()
+
+    if args.image:
+        img = cv2.imread(str(args.image))
+        if img is None:
+            print(f"Error: 画像が読み込めません: {args.image}", file=sys.stderr)
+            return 1
+    else:
+        img = synthesize_card(args.scale)
+
+    excludes = args.excludes or ["0,0,0.3,1.0"]
+    kwargs = {
+        "exclude_regions": [parse_region(r) for r in excludes],
+        "dilate_iterations": args.dilate,
+    }
+
+    h, w = img.shape[:2]
+    print(f"画像: {w}x{h}, 除外領域: {len(excludes)}個, 膨張: {args.dilate}回")
+
+    old_mask, old_time, old_peak = measure(
+        legacy_auto_detect_text_regions, img, kwargs, args.repeat
+    )
+    new_mask, new_time, new_peak = measure(
+        auto_detect_text_regions, img, kwargs, args.repeat
+    )
+
+    print(f"\n{'実装':<8} {'処理時間 (ms)':>14} {'ピークメモリ (KiB)':>18}")
+    print("-" * 44)
+    print(f"{'変更前':<8} {old_time * 1000:>14.2f} {old_peak / 1024:>18.0f}")
+    print(f"{'変更後':<8} {new_time * 1000:>14.2f} {new_peak / 1024:>18.0f}")
+    print(
+        f"\n速度: {old_time / new_time:.2f} 倍, "
+        f"ピークメモリ: {new_peak / old_peak:.0%}（変更前比）"
+    )
+
+    if not np.array_equal(old_mask, new_mask):
+        print("出力マスク: 不一致", file=sys.stderr)
+        return 1
+    print("出力マスク: 一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+テンプレートのバージョン間で生成画像の差分を検出するスクリプト
+
+2つの出力セット（ディレクトリ、ZIP/TAR アーカイブ、または単一の画像）を
+名刺ごとに対応付け、ピクセル差分から変更領域のバウンディングボックスと
+差分スコア（変化したピクセルの割合）を求めます。
+名刺は出力 ID（名簿の行 ID、両面なら 0001_front）で対応付けるため、
+ディレクトリ出力とアーカイブ出力どうしも比較できます。
+
+使用例:
+    # backup_version.sh の2つのバージョンを比較
+    python scripts/diff_versions.py output/backup/card_v01.png output/backup/card_v02.png
+
+    # 名簿全体の出力（ディレクトリまたはアーカイブ）を比較
+    python scripts/diff_versions.py output/v1/ output/v2/
+    python scripts/diff_versions.py output/cards_v1.zip output/cards_v2.zip
+
+    # 差分を強調したオーバーレイ画像を出力
+    python scripts/diff_versions.py output/v1/ output/v2/ --overlay output/diff/
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+
+from PIL import Image, ImageDraw
+
+try:
+    import numpy as np
+except ImportError:
+    print("Error: numpy が必要です。pip install numpy でインストールしてください。")
+    sys.exit(1)
+
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".tif", ".tiff")
+
+# generator.py のアーカイブ出力に含まれるマニフェスト
+# （.tar では途中経過が manifest-NNNNNN.jsonl に分割して書かれる）
+MANIFEST_PATTERN = re.compile(r"manifest(-\d+)?\.jsonl")
+
+# オーバーレイで変更ピクセルを塗る色と不透明度
+HIGHLIGHT_COLOR = (255, 0, 0)
+HIGHLIGHT_ALPHA = 0.6
+
+
+class DiffError(Exception):
+    """出力セットを比較できない場合のエラー"""
+
+
+@dataclass
+class CardDiff:
+    """1枚の名刺の比較結果"""
+
+    key: str
+    status: str  # identical / unchanged / changed / resized / added / removed
+    score: float = 0.0
+    bbox: tuple[int, int, int, int] | None = None  # (left, top, right, bottom)
+    overlay: str | None = None
+
+
+@dataclass(frozen=True)
+class CardSource:
+    """
+    出力セット内の1枚への参照（画像ファイル、またはアーカイブ内のメンバー）
+
+    画像データは保持せず、比較するワーカーが必要なときに読み込む。
+    """
+
+    path: Path
+    size: int
+    member: str | None = None  # アーカイブ内のメンバー名
+    offset: int | None = None  # TAR メンバーのデータ開始位置
+    sha256: str | None = None  # アーカイブのマニフェストにある場合のみ
+
+    def read(self) -> bytes:
+        if self.member is None:
+            return self.path.read_bytes()
+        if self.offset is not None:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                return f.read(self.size)
+        return open_zip(self.path, os.getpid()).read(self.member)
+
+
+@lru_cache(maxsize=8)
+def open_zip(path: Path, pid: int) -> zipfile.ZipFile:
+    """
+    ZIP を開く（中央ディレクトリの解析を1回にするためキャッシュする）
+
+    fork したワーカーが親のファイル位置を共有しないよう、プロセス ID ごとに開く。
+    """
+    return zipfile.ZipFile(path)
+
+
+def file_source(path: Path) -> CardSource:
+    return CardSource(path, path.stat().st_size)
+
+
+def is_single_image(path: Path) -> bool:
+    return path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES
+
+
+def read_output_set(path: Path) -> tuple[dict[str, CardSource], dict[str, CardSource]]:
+    """
+    出力セット（ディレクトリまたは ZIP/TAR アーカイブ）を読み込む
+
+    読み込むのはファイル一覧とマニフェストだけで、画像データは読まない。
+
+    Returns:
+        (マニフェストの row_id をキーとする名刺,
+         マニフェストにない名刺（拡張子を除いたファイル名をキーとする）)
+    """
+    if path.is_dir():
+        return {}, {
+            file.relative_to(path).with_suffix("").as_posix(): file_source(file)
+            for file in sorted(path.rglob("*"))
+            if file.suffix.lower() in IMAGE_SUFFIXES
+        }
+
+    sources: dict[str, CardSource] = {}
+    manifest_lines: list[str] = []
+    if path.suffix.lower() == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if MANIFEST_PATTERN.fullmatch(info.filename):
+                    manifest_lines += archive.read(info).decode("utf-8").splitlines()
+                elif info.filename.lower().endswith(IMAGE_SUFFIXES):
+                    sources[info.filename] = CardSource(
+                        path, info.file_size, info.filename
+                    )
+    elif path.suffix.lower() == ".tar":
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                if MANIFEST_PATTERN.fullmatch(member.name):
+                    data = archive.extractfile(member).read()
+                    manifest_lines += data.decode("utf-8").splitlines()
+                elif member.name.lower().endswith(IMAGE_SUFFIXES):
+                    sources[member.name] = CardSource(
+                        path, member.size, member.name, member.offset_data
+                    )
+    else:
+        raise DiffError(f"出力セットとして読めません（ディレクトリ、.zip、.tar のみ）: {path}")
+
+    entries = {}
+    for line in manifest_lines:
+        entry = json.loads(line)
+        entries[entry["name"]] = entry
+
+    identified = {}
+    named = {}
+    for name, source in sources.items():
+        entry = entries.get(name)
+        if entry is not None:
+            identified[entry["row_id"]] = replace(source, sha256=entry.get("sha256"))
+        else:
+            # マニフェストの書き込み前に中断されたアーカイブの末尾など
+            named[str(PurePosixPath(name).with_suffix(""))] = source
+    return identified, named
+
+
+def strip_output_stem(
+    named: dict[str, CardSource], reference: set[str]
+) -> dict[str, CardSource]:
+    """
+    ファイル名から出力ファイル名の共通部分（card_0001.png の "card_"）を除き、
+    出力 ID（row_id、両面なら 0001_front）をキーにする
+
+    候補は全ファイルに共通する "_" までの接頭辞（1枚だけなら名前全体も候補）で、
+    reference（もう一方の出力セットの ID）と最も多く一致するものを選ぶ。
+    一致数が同じ場合は長い接頭辞を優先する。
+    """
+    if not named:
+        return {}
+
+    basenames = [key.rsplit("/", 1)[-1] for key in named]
+    common = os.path.commonprefix(basenames)
+    candidates = [""] + [common[: i + 1] for i, char in enumerate(common) if char == "_"]
+    if len(basenames) == 1:
+        # 名簿なしで生成した1枚（card.png）は ID が空
+        candidates.append(basenames[0])
+
+    def rekey(prefix: str) -> dict[str, CardSource]:
+        result = {}
+        for key, source in named.items():
+            directory, _, name = key.rpartition("/")
+            output_id = name[len(prefix) :]
+            result[f"{directory}/{output_id}" if directory else output_id] = source
+        return result
+
+    best = max(
+        candidates,
+        key=lambda prefix: (len(reference.intersection(rekey(prefix))), len(prefix)),
+    )
+    return rekey(best)
+
+
+def load_output_sets(
+    old_path: Path, new_path: Path
+) -> tuple[dict[str, CardSource], dict[str, CardSource]]:
+    """
+    2つの出力セットを読み込み、どちらも出力 ID をキーとする辞書にそろえる
+
+    単一の画像は、もう一方も1枚だけの場合に限りその1枚と比較する。
+    """
+    if is_single_image(old_path) and is_single_image(new_path):
+        return {"": file_source(old_path)}, {"": file_source(new_path)}
+
+    for single, other in ((old_path, new_path), (new_path, old_path)):
+        if is_single_image(single):
+            identified, named = read_output_set(other)
+            cards = list(identified.values()) + list(named.values())
+            if len(cards) != 1:
+                raise DiffError(
+                    f"単一の画像 {single} と {len(cards)} 枚の出力セット {other} は"
+                    "比較できません（名刺を対応付けられません）"
+                )
+            pair = {"": file_source(single)}, {"": cards[0]}
+            return pair if single == old_path else pair[::-1]
+
+    old_identified, old_named = read_output_set(old_path)
+    new_identified, new_named = read_output_set(new_path)
+    old_set = {**old_identified, **strip_output_stem(old_named, set(new_identified))}
+    new_set = {**new_identified, **strip_output_stem(new_named, set(old_set))}
+    return old_set, new_set
+
+
+def same_content(old: CardSource, new: CardSource) -> bool:
+    """バイト列が同一か（サイズ、マニフェストの SHA-256、バイト比較の順に判定）"""
+    if old.size != new.size:
+        return False
+    if old.sha256 and new.sha256:
+        return old.sha256 == new.sha256
+    return old.read() == new.read()
+
+
+def diff_card(
+    key: str,
+    old: CardSource,
+    new: CardSource,
+    tolerance: int,
+    overlay_dir: Path | None,
+) -> CardDiff:
+    """2枚の画像を読み込み、ピクセル単位で比較する（ワーカープロセスで実行）"""
+    old_img = Image.open(io.BytesIO(old.read())).convert("RGB")
+    new_img = Image.open(io.BytesIO(new.read())).convert("RGB")
+    if old_img.size != new_img.size:
+        w, h = new_img.size
+        return CardDiff(key, "resized", 1.0, (0, 0, w, h))
+
+    old_pixels = np.asarray(old_img, dtype=np.int16)
+    new_pixels = np.asarray(new_img, dtype=np.int16)
+    changed = np.abs(new_pixels - old_pixels).max(axis=2) > tolerance
+
+    if not changed.any():
+        return CardDiff(key, "unchanged")
+
+    rows = np.flatnonzero(changed.any(axis=1))
+    cols = np.flatnonzero(changed.any(axis=0))
+    bbox = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+    result = CardDiff(key, "changed", float(changed.mean()), bbox)
+
+    if overlay_dir is not None:
+        result.overlay = str(write_overlay(new_img, changed, bbox, overlay_dir, key))
+    return result
+
+
+def write_overlay(
+    img: Image.Image,
+    changed: np.ndarray,
+    bbox: tuple[int, int, int, int],
+    overlay_dir: Path,
+    key: str,
+) -> Path:
+    """新しい画像の変更ピクセルを赤く塗り、バウンディングボックスを描いて保存する"""
+    pixels = np.asarray(img, dtype=np.float32)
+    highlight = np.array(HIGHLIGHT_COLOR, dtype=np.float32)
+    pixels[changed] = pixels[changed] * (1 - HIGHLIGHT_ALPHA) + highlight * HIGHLIGHT_ALPHA
+    overlay = Image.fromarray(pixels.astype(np.uint8))
+
+    left, top, right, bottom = bbox
+    ImageDraw.Draw(overlay).rectangle(
+        (left, top, right - 1, bottom - 1), outline=HIGHLIGHT_COLOR, width=2
+    )
+
+    name = Path(key or "card").with_suffix("").as_posix().replace("/", "_")
+    output_path = overlay_dir / f"{name}_diff.png"
+    overlay.save(output_path)
+    return output_path
+
+
+def diff_output_sets(
+    old_path: Path,
+    new_path: Path,
+    tolerance: int = 0,
+    overlay_dir: Path | None = None,
+    jobs: int | None = None,
+) -> list[CardDiff]:
+    """
+    2つの出力セットを名刺ごとに比較する
+
+    同一ファイルは親プロセスで判定し、残りの組だけをワーカーに渡す。
+    """
+    old_set, new_set = load_output_sets(old_path, new_path)
+
+    if overlay_dir is not None:
+        overlay_dir.mkdir(parents=True, exist_ok=True)
+
+    results = [CardDiff(key, "removed") for key in old_set if key not in new_set]
+    results += [CardDiff(key, "added") for key in new_set if key not in old_set]
+
+    pending = []
+    for key in old_set:
+        if key not in new_set:
+            continue
+        if same_content(old_set[key], new_set[key]):
+            results.append(CardDiff(key, "identical"))
+        else:
+            pending.append(key)
+
+    if pending:
+        workers = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results += executor.map(
+                diff_card,
+                pending,
+                [old_set[key] for key in pending],
+                [new_set[key] for key in pending],
+                [tolerance] * len(pending),
+                [overlay_dir] * len(pending),
+                chunksize=max(1, len(pending) // (workers * 4)),
+            )
+
+    return sorted(results, key=lambda result: result.key)
+
+
+def print_results(results: list[CardDiff], show_all: bool = False) -> None:
+    """比較結果を表示"""
+    print(f"{'状態':<10} {'スコア':<10} {'変更領域 (left,top,right,bottom)':<36} 名刺")
+    print("-" * 80)
+
+    counts: dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+        if result.status in ("identical", "unchanged") and not show_all:
+            continue
+        bbox = ",".join(str(v) for v in result.bbox) if result.bbox else "-"
+        print(f"{result.status:<10} {result.score:<10.4%} {bbox:<36} {result.key or '-'}")
+
+    print("\n=== 集計 ===")
+    for status in ("identical", "unchanged", "changed", "resized", "added", "removed"):
+        if status in counts:
+            print(f"{status:<10} {counts[status]}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="テンプレートのバージョン間で生成画像の差分を検出する"
+    )
+    parser.add_argument(
+        "old",
+        type=Path,
+        help="比較元（ディレクトリ、.zip/.tar アーカイブ、または画像）",
+    )
+    parser.add_argument(
+        "new",
+        type=Path,
+        help="比較先（ディレクトリ、.zip/.tar アーカイブ、または画像）",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=int,
+        default=0,
+        help="変化とみなさないチャンネル値の差（0-255、デフォルト: 0）",
+    )
+    parser.add_argument(
+        "--overlay",
+        type=Path,
+        metavar="DIR",
+        help="差分を強調したオーバーレイ画像の出力先",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="並列プロセス数（デフォルト: CPU 数）",
+    )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        metavar="PATH",
+        help="比較結果を JSON で保存するパス",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="変更のない名刺も表示する",
+    )
+
+    args = parser.parse_args()
+
+    for path in (args.old, args.new):
+        if not path.exists():
+            print(f"Error: ファイルが見つかりません: {path}")
+            return 1
+
+    try:
+        results = diff_output_sets(
+            args.old, args.new, args.tolerance, args.overlay, args.jobs
+        )
+    except DiffError as e:
+        print(f"Error: {e}")
+        return 1
+    print_results(results, args.all)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(result) for result in results], f, ensure_ascii=False, indent=2)
+        print(f"\n比較結果を保存: {args.json}")
+
+    changed = any(result.status not in ("identical", "unchanged") for result in results)
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,9 @@
 
     # 2つの画像を比較
     python scripts/measure_positions.py input/original.png output/generated.png
+
+    # 高解像度スキャンを全解像度で走査（粗密探索を使わない基準モード）
+    python scripts/measure_positions.py input/scan_1200dpi.png --pyramid 1
 """
 
 import argparse
@@ -27,19 +30,31 @@ except ImportError:
 CARD_WIDTH_MM = 91
 CARD_HEIGHT_MM = 55
 
+# テキスト行をグループ化する際の最大間隔（ピクセル）
+ROW_GAP_PX = 5
+
+# 粗い画像を作る際に一度に処理する帯の高さ（粗い画像の行数）
+STRIP_BLOCKS = 64
+
 
-def find_text_regions(img_path: Path, threshold: int = 200) -> list[dict]:
+def find_text_regions(
+    img_path: Path, threshold: int = 200, pyramid: int = 4
+) -> list[dict]:
     """
     画像内のテキスト領域を検出する
 
     Args:
         img_path: 画像ファイルのパス
         threshold: テキスト検出の閾値（これより暗いピクセルをテキストとみなす）
+        pyramid: 粗密探索の縮小率（1 で全解像度を直接走査）
 
     Returns:
         各テキスト領域の情報を含む辞書のリスト
     """
     img = Image.open(img_path).convert("L")
+    if pyramid > 1:
+        return find_text_regions_pyramid(img, threshold, pyramid)
+
     pixels = np.array(img)
     h, w = pixels.shape
 
@@ -58,7 +73,7 @@ def find_text_regions(img_path: Path, threshold: int = 200) -> list[dict]:
         start = text_rows[0]
         prev = text_rows[0]
         for y in text_rows[1:]:
-            if y - prev > 5:  # 5ピクセル以上離れていたら新しいグループ
+            if y - prev > ROW_GAP_PX:  # 5ピクセル以上離れていたら新しいグループ
                 groups.append((start, prev))
                 start = y
             prev = y
@@ -76,14 +91,106 @@ def find_text_regions(img_path: Path, threshold: int = 200) -> list[dict]:
                 break
 
         regions.append(
-            {
-                "y_start_px": y_start,
-                "y_end_px": y_end,
-                "x_left_px": left_px,
-                "y_mm": y_start / px_per_mm_y,
-                "x_mm": left_px / px_per_mm_x,
-                "height_mm": (y_end - y_start) / px_per_mm_y,
-            }
+            make_region(y_start, y_end, left_px, px_per_mm_x, px_per_mm_y)
+        )
+
+    return regions
+
+
+def make_region(
+    y_start: int, y_end: int, left_px: int, px_per_mm_x: float, px_per_mm_y: float
+) -> dict:
+    """検出結果（ピクセル）から領域情報の辞書を作る"""
+    return {
+        "y_start_px": y_start,
+        "y_end_px": y_end,
+        "x_left_px": left_px,
+        "y_mm": y_start / px_per_mm_y,
+        "x_mm": left_px / px_per_mm_x,
+        "height_mm": (y_end - y_start) / px_per_mm_y,
+    }
+
+
+def strided_min(pixels: np.ndarray, factor: int, axis: int) -> np.ndarray:
+    """
+    axis 方向に factor ピクセルずつの最小値を取る
+
+    端数のブロックは残りのピクセルだけで最小値を取る。
+    """
+    pixels = np.moveaxis(pixels, axis, 0)
+    result = pixels[0::factor].copy()
+    for offset in range(1, factor):
+        part = pixels[offset::factor]
+        np.minimum(result[: len(part)], part, out=result[: len(part)])
+    return np.moveaxis(result, 0, axis)
+
+
+def min_pool(img: Image.Image, factor: int) -> np.ndarray:
+    """
+    画像を factor × factor のブロックごとの最小値に縮小する
+
+    平均ではなく最小値で縮小するため、ブロック内に1つでも閾値未満の
+    ピクセルがあれば縮小後も閾値未満になる（テキストを見落とさない）。
+    全解像度の配列は作らず、帯ごとに切り出して処理する。
+    """
+    w, h = img.size
+    strip_h = factor * STRIP_BLOCKS
+    strips = []
+    for top in range(0, h, strip_h):
+        strip = np.asarray(img.crop((0, top, w, min(top + strip_h, h))))
+        strips.append(strided_min(strided_min(strip, factor, 0), factor, 1))
+    return np.concatenate(strips)
+
+
+def find_text_regions_pyramid(
+    img: Image.Image, threshold: int, factor: int
+) -> list[dict]:
+    """
+    粗密探索でテキスト領域を検出する
+
+    縮小画像で候補のブロック行・ブロック列を求め、その窓の中だけを
+    全解像度で走査する。最小値プーリングにより候補は取りこぼしがないため、
+    結果は全解像度の走査と完全に一致する。
+    """
+    w, h = img.size
+    px_per_mm_x = w / CARD_WIDTH_MM
+    px_per_mm_y = h / CARD_HEIGHT_MM
+
+    coarse_dark = min_pool(img, factor) < threshold
+
+    # 縦方向: 候補ブロック行の中だけ全解像度で行ごとの最小値を求める
+    text_rows = []
+    for block_y in np.flatnonzero(coarse_dark.any(axis=1)):
+        top = block_y * factor
+        window = np.asarray(img.crop((0, top, w, min(top + factor, h))))
+        text_rows.extend(top + np.flatnonzero(window.min(axis=1) < threshold))
+
+    if not text_rows:
+        return []
+
+    # テキスト行をグループ化
+    text_rows = np.asarray(text_rows)
+    breaks = np.flatnonzero(np.diff(text_rows) > ROW_GAP_PX)
+    starts = np.concatenate(([text_rows[0]], text_rows[breaks + 1]))
+    ends = np.concatenate((text_rows[breaks], [text_rows[-1]]))
+
+    regions = []
+    for y_start, y_end in zip(starts.tolist(), ends.tolist()):
+        # 横方向: 候補ブロック列を左から順に全解像度で確認する
+        block_rows = coarse_dark[y_start // factor : y_end // factor + 1]
+        left_px = 0
+        for block_x in np.flatnonzero(block_rows.any(axis=0)):
+            left = block_x * factor
+            window = np.asarray(
+                img.crop((left, y_start, min(left + factor, w), y_end + 1))
+            )
+            dark_columns = np.flatnonzero(window.min(axis=0) < threshold)
+            if dark_columns.size:
+                left_px = left + int(dark_columns[0])
+                break
+
+        regions.append(
+            make_region(y_start, y_end, left_px, px_per_mm_x, px_per_mm_y)
         )
 
     return regions
@@ -170,6 +277,13 @@ def main() -> int:
         default=200,
         help="テキスト検出の閾値（デフォルト: 200）",
     )
+    parser.add_argument(
+        "--pyramid",
+        type=int,
+        choices=[1, 2, 4, 8],
+        default=4,
+        help="粗密探索の縮小率。1 で全解像度を直接走査（デフォルト: 4）",
+    )
 
     args = parser.parse_args()
 
@@ -178,7 +292,7 @@ def main() -> int:
         print(f"Error: ファイルが見つかりません: {args.image1}")
         return 1
 
-    regions1 = find_text_regions(args.image1, args.threshold)
+    regions1 = find_text_regions(args.image1, args.threshold, args.pyramid)
     print_regions(regions1, str(args.image1))
 
     # 比較モード
@@ -187,7 +301,7 @@ def main() -> int:
             print(f"Error: ファイルが見つかりません: {args.image2}")
             return 1
 
-        regions2 = find_text_regions(args.image2, args.threshold)
+        regions2 = find_text_regions(args.image2, args.threshold, args.pyramid)
         print_regions(regions2, str(args.image2))
         compare_regions(regions1, regions2)
 
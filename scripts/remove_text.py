@@ -95,6 +95,37 @@ def create_region_mask(
     return mask
 
 
+def region_bounds(
+    img_shape: tuple[int, int],
+    region: tuple[float, float, float, float],
+) -> tuple[int, int, int, int] | None:
+    """
+    領域（割合）をピクセル範囲に変換
+
+    create_region_mask の cv2.rectangle と同じく両端を含み、画像内にクリップする。
+
+    Args:
+        img_shape: (height, width)
+        region: (x1, y1, x2, y2) 形式（0.0-1.0の割合）
+
+    Returns:
+        スライス用の (top, bottom, left, right)。画像外なら None
+    """
+    h, w = img_shape
+    x1, y1, x2, y2 = region
+    left, right = sorted((int(w * x1), int(w * x2)))
+    top, bottom = sorted((int(h * y1), int(h * y2)))
+    if right < 0 or bottom < 0 or left >= w or top >= h:
+        return None
+    return max(top, 0), min(bottom, h - 1) + 1, max(left, 0), min(right, w - 1) + 1
+
+
+def threshold_lut(threshold: float, invert: bool = False) -> np.ndarray:
+    """cv2.threshold(THRESH_BINARY / THRESH_BINARY_INV, maxval=255) と同じ変換表"""
+    above = np.arange(256) > threshold
+    return np.where(above != invert, 255, 0).astype(np.uint8)
+
+
 def auto_detect_text_regions(
     img: np.ndarray,
     exclude_regions: list[tuple[float, float, float, float]] | None = None,
@@ -105,6 +136,10 @@ def auto_detect_text_regions(
     """
     白背景上のテキスト領域を自動検出
 
+    画像サイズのバッファを3枚だけ確保し、各処理は dst= で書き込む。
+    閾値処理は変換表（LUT）、繰り返しの膨張は同じ結果になる1回分の
+    カーネル、除外領域はマスク画像を作らずに範囲を0で塗って適用する。
+
     Args:
         img: 入力画像 (BGR)
         exclude_regions: 除外する領域のリスト
@@ -116,31 +151,40 @@ def auto_detect_text_regions(
         マスク画像（白=テキスト領域）
     """
     h, w = img.shape[:2]
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    text_mask = np.empty((h, w), dtype=np.uint8)
+    white_region = np.empty((h, w), dtype=np.uint8)
+    white_region_expanded = np.empty((h, w), dtype=np.uint8)
+
+    cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=text_mask)
 
     # 白背景領域を検出（高い値=白い部分）
-    _, white_region = cv2.threshold(gray, bg_threshold, 255, cv2.THRESH_BINARY)
+    cv2.LUT(text_mask, threshold_lut(bg_threshold), dst=white_region)
 
-    # 白背景領域を膨張させて、テキスト周辺も含める
-    kernel_bg = np.ones((10, 10), dtype=np.uint8)
-    white_region_expanded = cv2.dilate(white_region, kernel_bg, iterations=2)
+    # テキスト（暗いピクセル）を検出（グレースケールは以降使わないので上書き）
+    cv2.LUT(text_mask, threshold_lut(text_threshold, invert=True), dst=text_mask)
 
-    # テキスト（暗いピクセル）を検出
-    _, dark_pixels = cv2.threshold(gray, text_threshold, 255, cv2.THRESH_BINARY_INV)
+    # 白背景領域を膨張させて、テキスト周辺も含める
+    # （10x10 カーネルで2回膨張するのと同じ 19x19 カーネル、アンカー (10, 10)）
+    kernel_bg = np.ones((19, 19), dtype=np.uint8)
+    cv2.dilate(white_region, kernel_bg, dst=white_region_expanded, anchor=(10, 10))
 
     # 白背景領域内のテキストのみを対象
-    text_mask = cv2.bitwise_and(dark_pixels, white_region_expanded)
+    cv2.bitwise_and(text_mask, white_region_expanded, dst=text_mask)
 
     # 除外領域を適用
-    if exclude_regions:
-        exclude_mask = create_region_mask((h, w), exclude_regions)
-        exclude_mask_inv = cv2.bitwise_not(exclude_mask)
-        text_mask = cv2.bitwise_and(text_mask, exclude_mask_inv)
+    for region in exclude_regions or []:
+        bounds = region_bounds((h, w), region)
+        if bounds is not None:
+            top, bottom, left, right = bounds
+            text_mask[top:bottom, left:right] = 0
 
     # テキストマスクを膨張させて確実にカバー
+    # （3x3 カーネルで n 回膨張するのと同じ (2n+1)x(2n+1) カーネル）
     if dilate_iterations > 0:
-        kernel = np.ones((3, 3), dtype=np.uint8)
-        text_mask = cv2.dilate(text_mask, kernel, iterations=dilate_iterations)
+        size = 2 * dilate_iterations + 1
+        kernel = np.ones((size, size), dtype=np.uint8)
+        cv2.dilate(text_mask, kernel, dst=white_region)
+        return white_region
 
     return text_mask
 
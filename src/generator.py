@@ -1,20 +1,39 @@
 #!/usr/bin/env python3
 """
 Business Card Generator
-Generates PNG business card images from JSON layout specifications.
+Generates PNG or vector PDF business card images from JSON layout specifications.
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
+import hashlib
+import io
 import json
+import os
+import queue
 import re
+import signal
 import sys
+import tarfile
+import threading
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageCms, ImageDraw, ImageFont
+
+from qr import QrCodeError, qr_matrix
+
+if TYPE_CHECKING:
+    from pdf_document import PdfDocument, PdfImageRef, PdfPage
 
 
 # ============================================================================
@@ -51,6 +70,15 @@ FONT_FILES = {
     },
 }
 
+# PDF user space units (points) per millimeter
+MM_TO_PT = 72 / 25.4
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory ($XDG_CACHE_HOME or ~/.cache)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "business-card-generator"
+
 
 @dataclass
 class CardConfig:
@@ -58,6 +86,9 @@ class CardConfig:
 
     dpi: int = 300
     font_paths: list[Path] = field(default_factory=lambda: [Path("fonts")])
+    cache_dir: Path | None = field(default_factory=default_cache_dir)
+    color_mode: str = "rgb"
+    icc_profile: Path | None = None
 
     @property
     def mm_to_px_ratio(self) -> float:
@@ -95,24 +126,163 @@ class FontManager:
                     return full_path
         return None
 
+    def get_font_path(self, category: str, weight: str = "regular") -> Path:
+        """Get font file path. Raises FontNotFoundError if font not found."""
+        font_path = self._find_font_file(category, weight)
+        if font_path is None:
+            searched_paths = ", ".join(str(p) for p in self.config.font_paths)
+            raise FontNotFoundError(
+                f"Font not found: {category}/{weight}. "
+                f"Searched in: {searched_paths}"
+            )
+        return font_path
+
     def get_font(
         self, category: str, size_pt: float, weight: str = "regular"
     ) -> ImageFont.FreeTypeFont:
         """Get font with caching. Raises FontNotFoundError if font not found."""
         cache_key = (category, size_pt, weight)
         if cache_key not in self._cache:
-            font_path = self._find_font_file(category, weight)
-            if font_path is None:
-                searched_paths = ", ".join(str(p) for p in self.config.font_paths)
-                raise FontNotFoundError(
-                    f"Font not found: {category}/{weight}. "
-                    f"Searched in: {searched_paths}"
-                )
+            font_path = self.get_font_path(category, weight)
             size_px = self.config.pt_to_px(size_pt)
             self._cache[cache_key] = ImageFont.truetype(str(font_path), size_px)
         return self._cache[cache_key]
 
 
+# ============================================================================
+# Color Management
+# ============================================================================
+
+COLOR_MODES = ("rgb", "cmyk")
+
+
+class PrintColorTransform:
+    """
+    sRGB to CMYK conversion through the printer's ICC profile.
+
+    The ImageCms transform is built once per generator; layout colors are
+    converted once and cached, and image assets are converted once each
+    through ImageAssetCache, so no per-card full-canvas transform is needed.
+    """
+
+    def __init__(self, icc_profile: Path):
+        try:
+            self.profile_data = icc_profile.read_bytes()
+            output_profile = ImageCms.ImageCmsProfile(io.BytesIO(self.profile_data))
+        except (OSError, ImageCms.PyCMSError) as e:
+            raise CardGeneratorError(f"Cannot load ICC profile {icc_profile}: {e}") from e
+        if output_profile.profile.xcolor_space.strip() != "CMYK":
+            raise CardGeneratorError(f"ICC profile is not a CMYK profile: {icc_profile}")
+
+        self._transform = ImageCms.buildTransform(
+            ImageCms.createProfile("sRGB"), output_profile, "RGB", "CMYK"
+        )
+        self._colors: dict[str, tuple[int, int, int, int]] = {}
+
+    def color(self, hex_color: str) -> tuple[int, int, int, int]:
+        """Convert a #RRGGBB color to CMYK (cached)."""
+        if hex_color not in self._colors:
+            pixel = self.image(Image.new("RGB", (1, 1), hex_color))
+            self._colors[hex_color] = pixel.getpixel((0, 0))
+        return self._colors[hex_color]
+
+    def image(self, image: Image.Image) -> Image.Image:
+        """Convert an image to CMYK (alpha is dropped; use it as a paste mask)."""
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return ImageCms.applyTransform(image, self._transform)
+
+
+# ============================================================================
+# Glyph Coverage
+# ============================================================================
+
+
+class GlyphCoverageIndex:
+    """
+    Code points covered by each font file's cmap.
+
+    Built once per font and cached on disk as code point ranges, keyed by
+    the SHA-256 of the font file so replaced fonts are re-indexed.
+    """
+
+    def __init__(self, cache_dir: Path | None = None):
+        self.cache_dir = cache_dir / "glyph-coverage" if cache_dir else None
+        self._coverage: dict[Path, frozenset[int]] = {}
+
+    def coverage(self, font_path: Path) -> frozenset[int]:
+        """Get the set of code points the font can render."""
+        if font_path not in self._coverage:
+            data = font_path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            coverage = self._load(digest)
+            if coverage is None:
+                coverage = self._build(data, font_path)
+                self._save(digest, coverage, font_path)
+            self._coverage[font_path] = coverage
+        return self._coverage[font_path]
+
+    def _build(self, data: bytes, font_path: Path) -> frozenset[int]:
+        try:
+            from fontTools.ttLib import TTFont
+        except ImportError as e:
+            raise CardGeneratorError(
+                f"Glyph coverage requires fontTools (pip install fonttools): {e}"
+            ) from e
+        font = TTFont(io.BytesIO(data), lazy=True)
+        return frozenset((font.getBestCmap() or {}).keys())
+
+    def _load(self, digest: str) -> frozenset[int] | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self.cache_dir / f"{digest}.json", "r", encoding="utf-8") as f:
+                ranges = json.load(f)["ranges"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return frozenset(cp for start, end in ranges for cp in range(start, end + 1))
+
+    def _save(self, digest: str, coverage: frozenset[int], font_path: Path) -> None:
+        if self.cache_dir is None:
+            return
+        # Store as inclusive [start, end] ranges
+        ranges: list[list[int]] = []
+        for cp in sorted(coverage):
+            if ranges and ranges[-1][1] == cp - 1:
+                ranges[-1][1] = cp
+            else:
+                ranges.append([cp, cp])
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_dir / f"{digest}.json.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"font": font_path.name, "ranges": ranges}, f)
+            tmp_path.replace(self.cache_dir / f"{digest}.json")
+        except OSError as e:
+            print(f"Warning: Cannot write glyph coverage cache: {e}", file=sys.stderr)
+
+
+# Control characters are never drawn, so they are not coverage errors
+_CONTROL_CODE_POINTS = frozenset(range(0x20)) | frozenset(range(0x7F, 0xA0))
+
+
+@dataclass
+class MissingGlyphs:
+    """Characters in one text element that its font cannot render."""
+
+    row_id: str
+    side: str
+    element_id: str
+    font: str
+    code_points: list[int]
+
+    def format(self) -> str:
+        """One-line report, e.g. 0003 name_kanji [mincho/bold]: U+9AD9 髙"""
+        location = "/".join(part for part in (self.side, self.element_id) if part)
+        chars = ", ".join(f"U+{cp:04X} {chr(cp)}" for cp in self.code_points)
+        return f"{self.row_id or '-'} {location} [{self.font}]: {chars}"
+
+
 # ============================================================================
 # Placeholder Substitution
 # ============================================================================
@@ -120,14 +290,425 @@ class FontManager:
 PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
 
 
+@lru_cache(maxsize=4096)
+def compile_placeholders(text: str) -> tuple[tuple[str, str | None], ...]:
+    """
+    Split text into (literal, key) segments, cached per template string.
+
+    The final segment has key None; text without placeholders compiles to a
+    single segment.
+    """
+    segments = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        segments.append((text[position : match.start()], match.group(1)))
+        position = match.end()
+    segments.append((text[position:], None))
+    return tuple(segments)
+
+
 def substitute_placeholders(text: str, values: dict[str, str]) -> str:
     """Replace {{KEY}} placeholders with values."""
+    segments = compile_placeholders(text)
+    if len(segments) == 1:
+        return text
+
+    parts = []
+    for literal, key in segments:
+        parts.append(literal)
+        if key is not None:
+            parts.append(values.get(key, f"{{{{{key}}}}}"))
+    return "".join(parts)
+
+
+def resolve_asset_path(
+    src: str, placeholders: dict[str, str], base_path: Path | None = None
+) -> Path:
+    """Substitute placeholders in an asset path and resolve it against base_path."""
+    path = Path(substitute_placeholders(src, placeholders))
+    if not path.is_absolute() and base_path:
+        path = base_path / path
+    return path
+
+
+# ============================================================================
+# Roster
+# ============================================================================
+
+# Characters a row ID may not contain (it is used inside file names)
+ROW_ID_FORBIDDEN = ("/", "\\", "\0")
+
+
+def iter_roster(
+    path: Path, id_column: str | None = None
+) -> Iterator[tuple[str, dict[str, str]]]:
+    """
+    Stream (row_id, placeholders) pairs from a CSV roster.
+
+    The header row supplies the placeholder keys. Row IDs come from id_column
+    when given, otherwise from the 1-based row number. IDs become part of
+    output file and archive member names, so they must be non-empty and
+    free of path separators.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        if id_column and id_column not in (reader.fieldnames or []):
+            raise CardGeneratorError(f"Roster has no column '{id_column}': {path}")
+        for index, row in enumerate(reader, 1):
+            values = {key: value or "" for key, value in row.items() if key}
+            if not id_column:
+                yield f"{index:04d}", values
+                continue
+            row_id = values[id_column]
+            if not row_id.strip():
+                raise CardGeneratorError(
+                    f"Roster row {index} has an empty '{id_column}': {path}"
+                )
+            if any(sep in row_id for sep in ROW_ID_FORBIDDEN):
+                raise CardGeneratorError(
+                    f"Roster row {index} has '{id_column}' {row_id!r} containing a "
+                    f"path separator: {path}"
+                )
+            yield row_id, values
+
+
+def roster_output_path(output_path: Path, row_id: str) -> Path:
+    """Derive a per-row output path, e.g. output/card.png -> output/card_0001.png."""
+    return output_path.with_name(f"{output_path.stem}_{row_id}{output_path.suffix}")
+
+
+# ============================================================================
+# Output Sinks
+# ============================================================================
+
+
+def encode_image(image: Image.Image, **save_options: Any) -> bytes:
+    """Encode an image in memory (PNG unless save_options say otherwise)."""
+    buffer = io.BytesIO()
+    image.save(buffer, **{"format": "PNG", **save_options})
+    return buffer.getvalue()
+
+
+class OutputSink(ABC):
+    """Destination for encoded card images, keyed by roster row ID."""
+
+    def __init__(self, output_path: Path, suffix: str = ".png"):
+        self.output_path = output_path
+        self.suffix = suffix
+
+    def member_name(self, row_id: str) -> str:
+        """File name for a row, e.g. card_0001.png (card.png without a row ID)."""
+        stem = self.output_path.stem
+        return f"{stem}_{row_id}{self.suffix}" if row_id else f"{stem}{self.suffix}"
+
+    @abstractmethod
+    def write(self, row_id: str, data: bytes) -> None:
+        """Store the encoded image of one card (or one side of a card)."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> OutputSink:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class DirectorySink(OutputSink):
+    """Writes one PNG file per card next to output_path."""
+
+    def __init__(self, output_path: Path, suffix: str = ".png"):
+        super().__init__(output_path, suffix)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def path(self, row_id: str) -> Path:
+        """File written for a row (output_path itself without a row ID)."""
+        return roster_output_path(self.output_path, row_id) if row_id else self.output_path
+
+    def write(self, row_id: str, data: bytes) -> None:
+        path = self.path(row_id)
+        path.write_bytes(data)
+        print(f"Generated: {path}")
+
+
+class ArchiveSink(OutputSink):
+    """
+    Streams cards into a single archive, with manifest JSON-lines members
+    holding one entry (name, row_id, size, sha256) per card.
+    """
+
+    MANIFEST_NAME = "manifest.jsonl"
+
+    def __init__(self, output_path: Path, suffix: str = ".png"):
+        super().__init__(output_path, suffix)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._manifest: list[str] = []
+        self._closed = False
+
+    def write(self, row_id: str, data: bytes) -> None:
+        name = self.member_name(row_id)
+        self._add_member(name, data)
+        self._manifest.append(
+            json.dumps(
+                {
+                    "name": name,
+                    "row_id": row_id,
+                    "size": len(data),
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                },
+                ensure_ascii=False,
+            )
+        )
+        print(f"Generated: {self.output_path}:{name}")
+
+    def close(self) -> None:
+        """Write the manifest and finalize the archive (safe to call twice)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_manifest(self.MANIFEST_NAME)
+        self._finish()
+
+    def _write_manifest(self, name: str) -> None:
+        """Add the pending manifest entries as one member and clear them."""
+        manifest = "".join(f"{line}\n" for line in self._manifest)
+        self._add_member(name, manifest.encode("utf-8"))
+        self._manifest.clear()
+
+    @abstractmethod
+    def _add_member(self, name: str, data: bytes) -> None:
+        """Append one member to the archive."""
+
+    @abstractmethod
+    def _finish(self) -> None:
+        """Finalize the archive file."""
+
+
+class ZipSink(ArchiveSink):
+    """
+    ZIP archive sink. Members are stored uncompressed since PNG/TIFF data
+    is already deflated. The central directory and manifest.jsonl are
+    written on close, so a ZIP survives Ctrl-C and SIGTERM but not a hard
+    kill (SIGKILL, out of memory); use .tar for very large rosters.
+    """
+
+    def __init__(self, output_path: Path, suffix: str = ".png"):
+        super().__init__(output_path, suffix)
+        self._zip = zipfile.ZipFile(output_path, "w", zipfile.ZIP_STORED)
+
+    def _add_member(self, name: str, data: bytes) -> None:
+        self._zip.writestr(name, data)
+
+    def _finish(self) -> None:
+        self._zip.close()
+
+
+class TarSink(ArchiveSink):
+    """
+    TAR archive sink. Each member is flushed as soon as it is written, so a
+    killed run still leaves a readable archive of the completed cards.
+
+    The manifest is written in chunks as the run goes: every manifest_every
+    cards the pending entries become a manifest-NNNNNN.jsonl member, and the
+    last entries go into manifest.jsonl on close. Readers concatenate all
+    manifest members; after a hard kill only the cards written since the
+    last chunk are missing from it.
+    """
+
+    MANIFEST_CHUNK_NAME = "manifest-{:06d}.jsonl"
+
+    def __init__(self, output_path: Path, suffix: str = ".png", manifest_every: int = 64):
+        super().__init__(output_path, suffix)
+        self.manifest_every = max(1, manifest_every)
+        self._chunks = 0
+        self._tar = tarfile.open(output_path, "w", format=tarfile.PAX_FORMAT)
+
+    def write(self, row_id: str, data: bytes) -> None:
+        super().write(row_id, data)
+        if len(self._manifest) >= self.manifest_every:
+            self._chunks += 1
+            self._write_manifest(self.MANIFEST_CHUNK_NAME.format(self._chunks))
+
+    def _add_member(self, name: str, data: bytes) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+        self._tar.fileobj.flush()
+
+    def _finish(self) -> None:
+        self._tar.close()
+
+
+ARCHIVE_SINKS: dict[str, type[ArchiveSink]] = {".zip": ZipSink, ".tar": TarSink}
+
+
+def open_sink(output_path: Path, suffix: str = ".png") -> OutputSink:
+    """
+    Open the sink matching the output path (.zip/.tar archive or directory).
+    suffix is the file extension of the encoded images.
+    """
+    sink_class = ARCHIVE_SINKS.get(output_path.suffix.lower(), DirectorySink)
+    return sink_class(output_path, suffix)
+
+
+# ============================================================================
+# Asset Cache
+# ============================================================================
+
+
+class ImageAssetCache:
+    """
+    LRU cache of image assets converted and resized for rendering, shared by
+    every card and side rendered by one generator.
+
+    Only the requested variants are kept, never the full-resolution decodes
+    they were made from, and the cache is bounded by the pixel memory it
+    holds rather than by entry count. Srcs built from row values
+    (photos/{{ID}}.jpg) never hit the cache, so they must not pin
+    full-size photos.
+    """
+
+    # Image headers (mode, size) remembered for sizing without decoding
+    MAX_HEADERS = 4096
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        color_transform: PrintColorTransform | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.color_transform = color_transform
+        self._entries: OrderedDict[tuple, Image.Image] = OrderedDict()
+        self._headers: OrderedDict[Path, tuple[str, tuple[int, int]]] = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _image_bytes(image: Image.Image) -> int:
+        # Pillow stores every multi-band pixel in 4 bytes
+        bytes_per_pixel = 1 if image.mode in ("1", "L", "P") else 4
+        return image.width * image.height * bytes_per_pixel
+
+    def source_info(self, path: Path) -> tuple[str, tuple[int, int]]:
+        """
+        Render mode and pixel size of the image at path, read from its header
+        only. The mode is RGBA when the image has any transparency (alpha
+        band, palette or tRNS transparency), RGB otherwise.
+        """
+        info = self._headers.get(path)
+        if info is None:
+            with Image.open(path) as image:
+                transparent = "A" in image.getbands() or "transparency" in image.info
+                info = ("RGBA" if transparent or image.mode != "RGB" else "RGB", image.size)
+            self._headers[path] = info
+            if len(self._headers) > self.MAX_HEADERS:
+                self._headers.popitem(last=False)
+        return info
+
+    def get(
+        self,
+        path: Path,
+        mode: str | None = None,
+        size: tuple[int, int] | None = None,
+    ) -> Image.Image:
+        """Get the image at path, optionally converted to mode and resized."""
+        key = (path, mode, size)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        image = self._load(path, mode, size)
+        image_bytes = self._image_bytes(image)
+        if image_bytes <= self.max_bytes:
+            self._entries[key] = image
+            self._bytes += image_bytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._image_bytes(evicted)
+        return image
+
+    def _load(
+        self, path: Path, mode: str | None, size: tuple[int, int] | None
+    ) -> Image.Image:
+        """Decode, convert and resize one variant (nothing is cached here)."""
+        if mode == "CMYK" and self.color_transform is not None:
+            # Color-transform the resized RGB/RGBA variant: Pillow premultiplies
+            # alpha when resizing RGBA, so transparent pixels don't bleed into
+            # the edges the way they would when resizing after alpha is dropped
+            render_mode, _ = self.source_info(path)
+            return self.color_transform.image(self.get(path, render_mode, size))
+
+        image = Image.open(path)
+        image.load()
+        if mode is not None and image.mode != mode:
+            image = image.convert(mode)
+        if size is not None and image.size != size:
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        return image
+
+
+# ============================================================================
+# QR Codes
+# ============================================================================
+
+# Module matrix rows ("0"/"1") to mask bytes for Image.frombytes
+_QR_MASK_LEVELS = bytes.maketrans(b"01", b"\x00\xff")
+_QR_DARK_RUN = re.compile(r"1+")
+# (element id, module count, size in px) already warned about 1 px modules
+_QR_SIZE_WARNED: set[tuple[str, int, int]] = set()
+
+
+def _escape_vcard(value: str) -> str:
+    """Escape a vCard 3.0 text value (RFC 2426 section 4); CR and CRLF become \\n."""
+    value = value.replace("\r\n", "\n").replace("\r", "\n")
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace(",", "\\,")
+        .replace(";", "\\;")
+    )
 
-    def replacer(match: re.Match) -> str:
-        key = match.group(1)
-        return values.get(key, match.group(0))
 
-    return PLACEHOLDER_PATTERN.sub(replacer, text)
+def qrcode_payload(element: dict[str, Any], placeholders: dict[str, str]) -> str:
+    """
+    Build the payload of a QR code element.
+
+    A "vcard" mapping of property names to templates becomes a vCard 3.0.
+    Substituted values are escaped, so ";" written in the template still
+    separates structured fields (N, ADR, ORG) while ";" inside a value does
+    not. Missing placeholders count as empty, and properties that substitute
+    to nothing are left out.
+    """
+    if "vcard" not in element:
+        return substitute_placeholders(element["content"], placeholders)
+
+    escaped = {key: _escape_vcard(value) for key, value in placeholders.items()}
+    for template in element["vcard"].values():
+        for _, key in compile_placeholders(template):
+            if key is not None:
+                escaped.setdefault(key, "")
+
+    lines = ["BEGIN:VCARD", "VERSION:3.0"]
+    for name, template in element["vcard"].items():
+        value = substitute_placeholders(template, escaped)
+        if value.strip(";"):
+            lines.append(f"{name}:{value}")
+    lines.append("END:VCARD")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def qrcode_modules(
+    element: dict[str, Any], placeholders: dict[str, str]
+) -> tuple[str, ...]:
+    """Module matrix of a QR code element (cached by payload in qr_matrix)."""
+    try:
+        return qr_matrix(
+            qrcode_payload(element, placeholders), element.get("error_correction", "M")
+        )
+    except QrCodeError as e:
+        raise CardGeneratorError(f"QR code element '{element.get('id')}': {e}") from e
 
 
 # ============================================================================
@@ -141,26 +722,21 @@ def render_image_element(
     config: CardConfig,
     placeholders: dict[str, str],
     base_path: Path | None = None,
+    assets: ImageAssetCache | None = None,
 ) -> None:
     """Render an image element onto the card."""
-    # Get image path, supporting placeholders
-    src = substitute_placeholders(element["src"], placeholders)
+    assets = assets or ImageAssetCache()
 
-    # Resolve relative paths
-    img_path = Path(src)
-    if not img_path.is_absolute() and base_path:
-        img_path = base_path / img_path
+    # Get image path, supporting placeholders and relative paths
+    img_path = resolve_asset_path(element["src"], placeholders, base_path)
 
     if not img_path.exists():
         print(f"Warning: Image not found: {img_path}", file=sys.stderr)
         return
 
-    # Load the image
-    element_img = Image.open(img_path)
-
-    # Convert to RGB/RGBA if needed
-    if element_img.mode not in ("RGB", "RGBA"):
-        element_img = element_img.convert("RGBA")
+    # Convert to RGB/RGBA; mode and size come from the file header, so only
+    # the final variant is decoded and cached
+    mode, (orig_w, orig_h) = assets.source_info(img_path)
 
     # Get target size
     position = element["position"]
@@ -169,8 +745,8 @@ def render_image_element(
 
     # Resize if dimensions specified
     size = element.get("size", {})
+    target_size = None
     if "width_mm" in size or "height_mm" in size:
-        orig_w, orig_h = element_img.size
 
         if "width_mm" in size and "height_mm" in size:
             # Both specified: use exact dimensions
@@ -185,10 +761,18 @@ def render_image_element(
             new_h = config.mm_to_px(size["height_mm"])
             new_w = round(orig_w * new_h / orig_h)
 
-        element_img = element_img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+        target_size = (new_w, new_h)
+
+    element_img = assets.get(img_path, mode, target_size)
 
     # Paste the image
-    if element_img.mode == "RGBA":
+    if image.mode == "CMYK":
+        # Color-managed copy of the resized image, converted once per asset
+        # and size; the resized RGBA image supplies the mask
+        mask = element_img.getchannel("A") if element_img.mode == "RGBA" else None
+        cmyk_img = assets.get(img_path, "CMYK", target_size)
+        image.paste(cmyk_img, (x_px, y_px), mask)
+    elif element_img.mode == "RGBA":
         image.paste(element_img, (x_px, y_px), element_img)
     else:
         image.paste(element_img, (x_px, y_px))
@@ -200,6 +784,7 @@ def render_text_element(
     config: CardConfig,
     font_manager: FontManager,
     placeholders: dict[str, str],
+    color_transform: PrintColorTransform | None = None,
 ) -> None:
     """Render a text element."""
     content = substitute_placeholders(element["content"], placeholders)
@@ -224,7 +809,218 @@ def render_text_element(
             x_px -= text_width
 
     color = font_spec.get("color", "#000000")
-    draw.text((x_px, y_px), content, font=font, fill=color)
+    fill = color_transform.color(color) if color_transform else color
+    draw.text((x_px, y_px), content, font=font, fill=fill)
+
+
+def render_image_element_pdf(
+    document: PdfDocument,
+    page: PdfPage,
+    element: dict[str, Any],
+    config: CardConfig,
+    placeholders: dict[str, str],
+    base_path: Path | None = None,
+    assets: ImageAssetCache | None = None,
+) -> None:
+    """Render an image element onto a PDF page, sharing the image XObject."""
+    img_path = resolve_asset_path(element["src"], placeholders, base_path)
+    if not img_path.exists():
+        print(f"Warning: Image not found: {img_path}", file=sys.stderr)
+        return
+
+    if assets is not None and assets.color_transform is not None:
+        pdf_image = _cmyk_pdf_image(document, assets, img_path)
+    else:
+        pdf_image = document.get_image(img_path.resolve(), img_path)
+    orig_w, orig_h = pdf_image.width, pdf_image.height
+
+    # Same sizing rules as the PNG renderer, in millimeters
+    size = element.get("size", {})
+    if "width_mm" in size and "height_mm" in size:
+        width_mm, height_mm = size["width_mm"], size["height_mm"]
+    elif "width_mm" in size:
+        width_mm = size["width_mm"]
+        height_mm = orig_h * width_mm / orig_w
+    elif "height_mm" in size:
+        height_mm = size["height_mm"]
+        width_mm = orig_w * height_mm / orig_h
+    else:
+        width_mm = orig_w / config.mm_to_px_ratio
+        height_mm = orig_h / config.mm_to_px_ratio
+
+    position = element["position"]
+    page.draw_image(
+        pdf_image,
+        position["x_mm"] * MM_TO_PT,
+        position["y_mm"] * MM_TO_PT,
+        width_mm * MM_TO_PT,
+        height_mm * MM_TO_PT,
+    )
+
+
+def _cmyk_pdf_image(
+    document: PdfDocument, assets: ImageAssetCache, img_path: Path
+) -> PdfImageRef:
+    """Embed the color-managed CMYK version of an asset (once per document)."""
+    key = (img_path.resolve(), "CMYK")
+    pdf_image = document.get_image(key)
+    if pdf_image is None:
+        mode, _ = assets.source_info(img_path)
+        mask = assets.get(img_path, "RGBA").getchannel("A") if mode == "RGBA" else None
+        if mask is not None and mask.getextrema() == (255, 255):
+            mask = None  # e.g. grayscale without transparency
+        pdf_image = document.add_image(key, assets.get(img_path, "CMYK"), mask)
+    return pdf_image
+
+
+def render_qrcode_element(
+    image: Image.Image,
+    element: dict[str, Any],
+    config: CardConfig,
+    placeholders: dict[str, str],
+    color_transform: PrintColorTransform | None = None,
+) -> None:
+    """
+    Render a QR code element with whole-pixel modules (no resampling blur).
+
+    Every module is the same whole number of device pixels; pixels left
+    over from size_mm widen the quiet zone, keeping the symbol centered.
+    """
+    modules = qrcode_modules(element, placeholders)
+    quiet_zone = element.get("quiet_zone", 4)
+    count = len(modules) + 2 * quiet_zone
+
+    x_px = config.mm_to_px(element["position"]["x_mm"])
+    y_px = config.mm_to_px(element["position"]["y_mm"])
+    size_px = config.mm_to_px(element["size_mm"])
+    module_px = size_px // count
+    element_id = element.get("id", "qrcode")
+    if module_px < 1:
+        raise CardGeneratorError(
+            f"QR code {element_id!r} needs {count} modules (including the quiet "
+            f"zone) but size_mm is only {size_px} px at {config.dpi} DPI"
+        )
+    if module_px < 2 and (element_id, count, size_px) not in _QR_SIZE_WARNED:
+        _QR_SIZE_WARNED.add((element_id, count, size_px))
+        print(
+            f"Warning: QR code {element_id!r} modules are 1 px at {config.dpi} DPI "
+            f"and may not scan; increase size_mm or dpi",
+            file=sys.stderr,
+        )
+    symbol_px = module_px * len(modules)
+    start = (size_px - symbol_px) // 2
+
+    color = element.get("color", "#000000")
+    background = element.get("background", "#FFFFFF")
+    if color_transform:
+        color = color_transform.color(color)
+        background = color_transform.color(background)
+
+    image.paste(background, (x_px, y_px, x_px + size_px, y_px + size_px))
+    mask = Image.frombytes(
+        "L",
+        (len(modules), len(modules)),
+        "".join(modules).encode("ascii").translate(_QR_MASK_LEVELS),
+    )
+    mask = mask.resize((symbol_px, symbol_px), Image.Resampling.NEAREST)
+    image.paste(color, (x_px + start, y_px + start), mask)
+
+
+def render_qrcode_element_pdf(
+    page: PdfPage,
+    element: dict[str, Any],
+    placeholders: dict[str, str],
+    color_transform: PrintColorTransform | None = None,
+) -> None:
+    """Render a QR code element as vector rectangles, one per run of dark modules."""
+    modules = qrcode_modules(element, placeholders)
+    quiet_zone = element.get("quiet_zone", 4)
+    count = len(modules) + 2 * quiet_zone
+
+    x = element["position"]["x_mm"] * MM_TO_PT
+    y = element["position"]["y_mm"] * MM_TO_PT
+    size = element["size_mm"] * MM_TO_PT
+
+    color = element.get("color", "#000000")
+    background = element.get("background", "#FFFFFF")
+    if color_transform:
+        color = color_transform.color(color)
+        background = color_transform.color(background)
+
+    page.fill_rect(x, y, size, size, background)
+    cells = [
+        (match.start() + quiet_zone, row + quiet_zone, match.end() - match.start(), 1)
+        for row, line in enumerate(modules)
+        for match in _QR_DARK_RUN.finditer(line)
+    ]
+    page.fill_cells(x, y, size / count, cells, color)
+
+
+def render_text_element_pdf(
+    document: PdfDocument,
+    page: PdfPage,
+    element: dict[str, Any],
+    font_manager: FontManager,
+    placeholders: dict[str, str],
+    color_transform: PrintColorTransform | None = None,
+) -> None:
+    """Render a text element onto a PDF page as real text."""
+    content = substitute_placeholders(element["content"], placeholders)
+    font_spec = element["font"]
+
+    font = document.get_font(
+        font_manager.get_font_path(
+            font_spec["category"], font_spec.get("weight", "regular")
+        )
+    )
+    size_pt = font_spec["size_pt"]
+
+    x_pt = element["position"]["x_mm"] * MM_TO_PT
+    y_pt = element["position"]["y_mm"] * MM_TO_PT
+
+    align = element.get("align", "left")
+    if align in ("center", "right"):
+        text_width = font.text_width(content, size_pt)
+        if align == "center":
+            x_pt -= text_width / 2
+        else:  # right
+            x_pt -= text_width
+
+    color = font_spec.get("color", "#000000")
+    fill = color_transform.color(color) if color_transform else color
+    page.draw_text(font, size_pt, x_pt, y_pt, content, fill)
+
+
+# ============================================================================
+# Layout Sides
+# ============================================================================
+
+SIDE_CARD_KEYS = ("background", "background_image")
+
+
+def layout_sides(layout: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Split a layout into (side_name, single-sided layout) pairs.
+
+    Layouts without "sides" yield one unnamed side. Each side shares the card
+    size and may override the card background and background image.
+    """
+    sides = layout.get("sides")
+    if not sides:
+        return [("", layout)]
+
+    result = []
+    for index, side in enumerate(sides, 1):
+        card_spec = dict(layout["card"])
+        card_spec.update({key: side[key] for key in SIDE_CARD_KEYS if key in side})
+        side_layout = {**layout, "card": card_spec, "elements": side.get("elements", [])}
+        result.append((side.get("name", f"side{index}"), side_layout))
+    return result
+
+
+def side_output_id(row_id: str, side_name: str) -> str:
+    """Combine a roster row ID and side name into one output ID, e.g. 0001_front."""
+    return "_".join(part for part in (row_id, side_name) if part)
 
 
 # ============================================================================
@@ -238,6 +1034,39 @@ class CardGenerator:
     def __init__(self, config: CardConfig | None = None):
         self.config = config or CardConfig()
         self.font_manager = FontManager(self.config)
+        self.color_transform = self._create_color_transform()
+        self.assets = ImageAssetCache(color_transform=self.color_transform)
+        self.glyph_coverage = GlyphCoverageIndex(self.config.cache_dir)
+
+    def _create_color_transform(self) -> PrintColorTransform | None:
+        """Build the print color transform for CMYK mode (None for RGB)."""
+        if self.config.color_mode not in COLOR_MODES:
+            raise CardGeneratorError(f"Unknown color mode: {self.config.color_mode}")
+        if self.config.color_mode == "rgb":
+            return None
+        if self.config.icc_profile is None:
+            raise CardGeneratorError("CMYK output requires an ICC profile")
+        return PrintColorTransform(self.config.icc_profile)
+
+    @property
+    def image_suffix(self) -> str:
+        """File extension of encoded images: .png (RGB) or .tif (CMYK)."""
+        return ".tif" if self.color_transform else ".png"
+
+    def save_options(self) -> dict[str, Any]:
+        """Pillow save options: PNG for RGB, deflate TIFF with ICC profile for CMYK."""
+        if self.color_transform is None:
+            return {"format": "PNG"}
+        return {
+            "format": "TIFF",
+            "compression": "tiff_adobe_deflate",
+            "icc_profile": self.color_transform.profile_data,
+            "dpi": (self.config.dpi, self.config.dpi),
+        }
+
+    def encode(self, image: Image.Image) -> bytes:
+        """Encode a rendered card in memory."""
+        return encode_image(image, **self.save_options())
 
     def load_layout(self, path: Path) -> dict[str, Any]:
         """Load and parse JSON layout file."""
@@ -251,7 +1080,52 @@ class CardGenerator:
         placeholders: dict[str, str] | None = None,
         base_path: Path | None = None,
     ) -> None:
-        """Render layout to PNG image."""
+        """
+        Render layout to PNG image, or CMYK TIFF in print color mode
+        (one file per side for multi-side layouts).
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        for side_name, image in self.render_sides(layout, placeholders, base_path):
+            side_path = roster_output_path(output_path, side_name) if side_name else output_path
+            image.save(side_path, **self.save_options())
+            print(f"Generated: {side_path}")
+
+    def render_to_sink(
+        self,
+        layout: dict[str, Any],
+        rows: Iterable[tuple[str, dict[str, str]]],
+        sink: OutputSink,
+        base_path: Path | None = None,
+    ) -> None:
+        """Render each (row_id, placeholders) row and write one image per side to sink."""
+        for row_id, placeholders in rows:
+            for side_name, image in self.render_sides(layout, placeholders, base_path):
+                sink.write(side_output_id(row_id, side_name), self.encode(image))
+
+    def render_sides(
+        self,
+        layout: dict[str, Any],
+        placeholders: dict[str, str] | None = None,
+        base_path: Path | None = None,
+    ) -> list[tuple[str, Image.Image]]:
+        """
+        Render every side of a layout from one placeholder set.
+
+        Fonts, decoded assets and compiled placeholders are cached on the
+        generator, so later sides reuse the work done for earlier ones.
+        """
+        return [
+            (side_name, self.render_image(side_layout, placeholders, base_path))
+            for side_name, side_layout in layout_sides(layout)
+        ]
+
+    def render_image(
+        self,
+        layout: dict[str, Any],
+        placeholders: dict[str, str] | None = None,
+        base_path: Path | None = None,
+    ) -> Image.Image:
+        """Render a single-sided layout (or one entry of layout_sides) to an image."""
         placeholders = placeholders or {}
 
         # Create image
@@ -260,46 +1134,686 @@ class CardGenerator:
         height_px = self.config.mm_to_px(card_spec["height_mm"])
         background = card_spec.get("background", "#FFFFFF")
 
-        image = Image.new("RGB", (width_px, height_px), background)
+        # Print mode draws directly on a CMYK canvas with pre-converted colors
+        if self.color_transform:
+            mode, background = "CMYK", self.color_transform.color(background)
+        else:
+            mode = "RGB"
+        image = Image.new(mode, (width_px, height_px), background)
 
         # Load background image if specified
         bg_image_path = card_spec.get("background_image")
         if bg_image_path:
-            bg_path = Path(substitute_placeholders(bg_image_path, placeholders))
-            if not bg_path.is_absolute() and base_path:
-                bg_path = base_path / bg_path
+            bg_path = resolve_asset_path(bg_image_path, placeholders, base_path)
 
             if bg_path.exists():
-                bg_img = Image.open(bg_path)
-                if bg_img.mode != "RGB":
-                    bg_img = bg_img.convert("RGB")
-                # Resize to card size
-                bg_img = bg_img.resize((width_px, height_px), Image.Resampling.LANCZOS)
+                # Converted and resized to card size once per asset
+                bg_img = self.assets.get(bg_path, mode, (width_px, height_px))
                 image.paste(bg_img, (0, 0))
             else:
                 print(f"Warning: Background image not found: {bg_path}", file=sys.stderr)
 
         draw = ImageDraw.Draw(image)
 
-        # Render elements (images first, then text on top)
+        # Render elements (images and QR codes first, then text on top)
         for element in layout.get("elements", []):
             element_type = element.get("type")
             if element_type == "image":
                 render_image_element(
-                    image, element, self.config, placeholders, base_path
+                    image, element, self.config, placeholders, base_path, self.assets
+                )
+            elif element_type == "qrcode":
+                render_qrcode_element(
+                    image, element, self.config, placeholders, self.color_transform
                 )
 
         for element in layout.get("elements", []):
             element_type = element.get("type")
             if element_type == "text":
                 render_text_element(
-                    draw, element, self.config, self.font_manager, placeholders
+                    draw,
+                    element,
+                    self.config,
+                    self.font_manager,
+                    placeholders,
+                    self.color_transform,
                 )
 
-        # Save output
+        return image
+
+    def render_pdf(
+        self,
+        layout: dict[str, Any],
+        output_path: Path,
+        placeholder_sets: Iterable[dict[str, str]],
+        base_path: Path | None = None,
+    ) -> None:
+        """
+        Render placeholder sets into a single vector PDF, one page per side,
+        with the sides of each card on consecutive pages.
+        """
+        try:
+            from pdf_document import PdfDocument, PdfError
+        except ImportError as e:
+            raise CardGeneratorError(
+                f"PDF output requires fontTools (pip install fonttools): {e}"
+            ) from e
+
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        image.save(output_path, "PNG")
-        print(f"Generated: {output_path}")
+        document = PdfDocument(output_path, layout.get("metadata", {}).get("name", ""))
+        if self.color_transform:
+            document.output_intent = self.color_transform.profile_data
+        try:
+            sides = layout_sides(layout)
+            for placeholders in placeholder_sets:
+                for _, side_layout in sides:
+                    self._render_pdf_page(document, side_layout, placeholders, base_path)
+            document.save()
+        except PdfError as e:
+            raise CardGeneratorError(str(e)) from e
+        finally:
+            # Removes a partly written file if rendering failed
+            document.close()
+        print(f"Generated: {output_path} ({len(document.pages)} pages)")
+
+    def preflight(
+        self,
+        layout: dict[str, Any],
+        rows: Iterable[tuple[str, dict[str, str]]],
+    ) -> Iterator[MissingGlyphs]:
+        """
+        Check every text element of every row against the font it will use,
+        without rendering. Yields one MissingGlyphs per affected element.
+        """
+        # Per text element: (side, id, font name, coverage, literal misses, keys)
+        checks = []
+        for side_name, side_layout in layout_sides(layout):
+            for element in side_layout.get("elements", []):
+                if element.get("type") != "text":
+                    continue
+                font_spec = element["font"]
+                category = font_spec["category"]
+                weight = font_spec.get("weight", "regular")
+                coverage = self.glyph_coverage.coverage(
+                    self.font_manager.get_font_path(category, weight)
+                )
+                segments = compile_placeholders(element["content"])
+                literal = "".join(text for text, _ in segments)
+                keys = [key for _, key in segments if key is not None]
+                checks.append(
+                    (
+                        side_name,
+                        element.get("id", ""),
+                        f"{category}/{weight}",
+                        coverage,
+                        frozenset(map(ord, literal)) - coverage - _CONTROL_CODE_POINTS,
+                        keys,
+                    )
+                )
+
+        # Roster values repeat heavily (company, address...), so each distinct
+        # value is checked once per font
+        misses: dict[tuple[int, str], frozenset[int]] = {}
+        for row_id, values in rows:
+            for side_name, element_id, font_name, coverage, missing, keys in checks:
+                for key in keys:
+                    value = values.get(key, f"{{{{{key}}}}}")
+                    memo_key = (id(coverage), value)
+                    value_missing = misses.get(memo_key)
+                    if value_missing is None:
+                        value_missing = (
+                            frozenset(map(ord, value)) - coverage - _CONTROL_CODE_POINTS
+                        )
+                        misses[memo_key] = value_missing
+                    if value_missing:
+                        missing = missing | value_missing
+                if missing:
+                    yield MissingGlyphs(
+                        row_id, side_name, element_id, font_name, sorted(missing)
+                    )
+
+    def _render_pdf_page(
+        self,
+        document: PdfDocument,
+        layout: dict[str, Any],
+        placeholders: dict[str, str],
+        base_path: Path | None = None,
+    ) -> None:
+        """Append one card page to a PDF document."""
+        card_spec = layout["card"]
+        page = document.new_page(card_spec["width_mm"], card_spec["height_mm"])
+        background = card_spec.get("background", "#FFFFFF")
+        if self.color_transform:
+            background = self.color_transform.color(background)
+        page.fill_rect(0, 0, page.width, page.height, background)
+
+        bg_image_path = card_spec.get("background_image")
+        if bg_image_path:
+            bg_path = resolve_asset_path(bg_image_path, placeholders, base_path)
+            if bg_path.exists():
+                if self.color_transform:
+                    bg_image = _cmyk_pdf_image(document, self.assets, bg_path)
+                else:
+                    bg_image = document.get_image(bg_path.resolve(), bg_path)
+                page.draw_image(bg_image, 0, 0, page.width, page.height)
+            else:
+                print(f"Warning: Background image not found: {bg_path}", file=sys.stderr)
+
+        # Render elements (images and QR codes first, then text on top)
+        for element in layout.get("elements", []):
+            if element.get("type") == "image":
+                render_image_element_pdf(
+                    document,
+                    page,
+                    element,
+                    self.config,
+                    placeholders,
+                    base_path,
+                    self.assets,
+                )
+            elif element.get("type") == "qrcode":
+                render_qrcode_element_pdf(
+                    page, element, placeholders, self.color_transform
+                )
+
+        for element in layout.get("elements", []):
+            if element.get("type") == "text":
+                render_text_element_pdf(
+                    document,
+                    page,
+                    element,
+                    self.font_manager,
+                    placeholders,
+                    self.color_transform,
+                )
+
+
+# ============================================================================
+# Pipelined Batch Execution
+# ============================================================================
+
+
+@dataclass
+class StageStats:
+    """Time accounting for one pipeline stage, summed over its workers."""
+
+    name: str
+    workers: int = 1
+    items: int = 0
+    busy_s: float = 0.0
+    starved_s: float = 0.0
+    blocked_s: float = 0.0
+
+    def format(self, elapsed_s: float) -> str:
+        """One-line summary with percentages of the stage's worker time."""
+        total = max(elapsed_s * self.workers, 1e-9)
+        return (
+            f"  {self.name:<7} workers={self.workers:<3} items={self.items:<7} "
+            f"busy={self.busy_s / total:6.1%} starved={self.starved_s / total:6.1%} "
+            f"blocked={self.blocked_s / total:6.1%}"
+        )
+
+
+class _PipelineStopped(Exception):
+    """Raised inside stage threads when another stage has failed."""
+
+
+_END = object()
+
+
+class PipelineExecutor:
+    """
+    Runs a batch as four concurrent stages joined by bounded queues:
+
+        read rows -> render (1 thread) -> encode (thread pool) -> write
+
+    Image encoding runs in Pillow's C encoder, which releases the GIL, so it
+    overlaps with rendering and with the writer's disk I/O. Bounded queues
+    apply backpressure so at most queue_depth items wait between stages.
+    Cards are written in roster order; the renderer takes a slot from a
+    window of 2 * queue_depth + encode_workers images before emitting each
+    one and the writer returns it once the image is written, so a slow
+    encode cannot make the writer's reorder buffer grow without bound.
+    """
+
+    def __init__(
+        self,
+        generator: CardGenerator,
+        queue_depth: int = 8,
+        encode_workers: int | None = None,
+    ):
+        self.generator = generator
+        self.queue_depth = max(1, queue_depth)
+        self.encode_workers = max(1, encode_workers or os.cpu_count() or 1)
+        # Images alive between the renderer and the writer (see class docstring)
+        self.window = 2 * self.queue_depth + self.encode_workers
+        self._stop = threading.Event()
+        self._window = threading.Semaphore(self.window)
+
+    def _get(self, source: queue.Queue, stats: StageStats) -> Any:
+        started = time.perf_counter()
+        while True:
+            try:
+                item = source.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _PipelineStopped from None
+        stats.starved_s += time.perf_counter() - started
+        return item
+
+    def _put(self, target: queue.Queue, item: Any, stats: StageStats) -> None:
+        started = time.perf_counter()
+        while True:
+            try:
+                target.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _PipelineStopped from None
+        stats.blocked_s += time.perf_counter() - started
+
+    def _acquire_slot(self, stats: StageStats) -> None:
+        started = time.perf_counter()
+        while not self._window.acquire(timeout=0.1):
+            if self._stop.is_set():
+                raise _PipelineStopped
+        stats.blocked_s += time.perf_counter() - started
+
+    def _run_stage(self, errors: list[BaseException], body: Any, *args: Any) -> None:
+        try:
+            body(*args)
+        except _PipelineStopped:
+            pass
+        except BaseException as e:
+            errors.append(e)
+            self._stop.set()
+
+    def _read(
+        self,
+        rows: Iterable[tuple[str, dict[str, str]]],
+        target: queue.Queue,
+        stats: StageStats,
+    ) -> None:
+        iterator = iter(rows)
+        seq = 0
+        while True:
+            started = time.perf_counter()
+            row = next(iterator, _END)
+            stats.busy_s += time.perf_counter() - started
+            if row is _END:
+                break
+            self._put(target, (seq, *row), stats)
+            stats.items += 1
+            seq += 1
+        self._put(target, _END, stats)
+
+    def _render(
+        self,
+        layout: dict[str, Any],
+        base_path: Path | None,
+        source: queue.Queue,
+        target: queue.Queue,
+        stats: StageStats,
+    ) -> None:
+        seq = 0
+        while (item := self._get(source, stats)) is not _END:
+            _, row_id, placeholders = item
+            started = time.perf_counter()
+            images = self.generator.render_sides(layout, placeholders, base_path)
+            stats.busy_s += time.perf_counter() - started
+            for side_name, image in images:
+                self._acquire_slot(stats)
+                self._put(target, (seq, side_output_id(row_id, side_name), image), stats)
+                seq += 1
+            stats.items += 1
+        # One end marker per encode worker
+        for _ in range(self.encode_workers):
+            self._put(target, _END, stats)
+
+    def _encode(self, source: queue.Queue, target: queue.Queue, stats: StageStats) -> None:
+        while (item := self._get(source, stats)) is not _END:
+            seq, row_id, image = item
+            started = time.perf_counter()
+            data = self.generator.encode(image)
+            stats.busy_s += time.perf_counter() - started
+            stats.items += 1
+            self._put(target, (seq, row_id, data), stats)
+        self._put(target, _END, stats)
+
+    def run(
+        self,
+        layout: dict[str, Any],
+        rows: Iterable[tuple[str, dict[str, str]]],
+        sink: OutputSink,
+        base_path: Path | None = None,
+    ) -> list[StageStats]:
+        """Render all rows into sink; the writer stage runs in the calling thread."""
+        self._stop.clear()
+        self._window = threading.Semaphore(self.window)
+        read_stats = StageStats("read")
+        render_stats = StageStats("render")
+        encode_stats = [StageStats("encode") for _ in range(self.encode_workers)]
+        write_stats = StageStats("write")
+        row_queue: queue.Queue = queue.Queue(self.queue_depth)
+        image_queue: queue.Queue = queue.Queue(self.queue_depth)
+        data_queue: queue.Queue = queue.Queue(self.queue_depth)
+        errors: list[BaseException] = []
+
+        threads = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(errors, self._read, rows, row_queue, read_stats),
+                name="pipeline-read",
+            ),
+            threading.Thread(
+                target=self._run_stage,
+                args=(
+                    errors,
+                    self._render,
+                    layout,
+                    base_path,
+                    row_queue,
+                    image_queue,
+                    render_stats,
+                ),
+                name="pipeline-render",
+            ),
+        ]
+        threads += [
+            threading.Thread(
+                target=self._run_stage,
+                args=(errors, self._encode, image_queue, data_queue, worker_stats),
+                name=f"pipeline-encode-{i}",
+            )
+            for i, worker_stats in enumerate(encode_stats)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            # Writer: reorder by sequence number so output follows the roster
+            pending: dict[int, tuple[str, bytes]] = {}
+            next_seq = 0
+            finished_workers = 0
+            while finished_workers < self.encode_workers:
+                item = self._get(data_queue, write_stats)
+                if item is _END:
+                    finished_workers += 1
+                    continue
+                seq, row_id, data = item
+                pending[seq] = (row_id, data)
+                while next_seq in pending:
+                    row_id, data = pending.pop(next_seq)
+                    write_started = time.perf_counter()
+                    sink.write(row_id, data)
+                    write_stats.busy_s += time.perf_counter() - write_started
+                    write_stats.items += 1
+                    next_seq += 1
+                    self._window.release()
+        except _PipelineStopped:
+            pass
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+        elapsed = time.perf_counter() - started
+        stats = [
+            read_stats,
+            render_stats,
+            StageStats(
+                "encode",
+                workers=self.encode_workers,
+                items=sum(s.items for s in encode_stats),
+                busy_s=sum(s.busy_s for s in encode_stats),
+                starved_s=sum(s.starved_s for s in encode_stats),
+                blocked_s=sum(s.blocked_s for s in encode_stats),
+            ),
+            write_stats,
+        ]
+        print(f"Pipeline: {write_stats.items} images in {elapsed:.2f}s", file=sys.stderr)
+        for stage in stats:
+            print(stage.format(elapsed), file=sys.stderr)
+        return stats
+
+
+# ============================================================================
+# Checkpointed Batch Execution
+# ============================================================================
+
+
+def row_digest(placeholders: dict[str, str]) -> str:
+    """Digest of a row's merged placeholder values, to detect edited rows."""
+    return hashlib.sha256(
+        json.dumps(placeholders, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class BatchJournal:
+    """
+    Append-only JSON-lines record of a batch run, used to resume after a crash.
+
+    The first line identifies the run (template digest, output, color and
+    font settings, --set values, ID column); every later line records one
+    row outcome: "done" with the digest of the row's values and the files
+    written, or "failed" with the error. Lines are flushed as they are
+    written but fsynced only every sync_every records (and on close), so a
+    crash loses at most one batch of records, whose rows are rendered again.
+    """
+
+    def __init__(self, path: Path, run_info: dict[str, Any], sync_every: int = 64):
+        self.path = path
+        self.run_info = run_info
+        self.sync_every = max(1, sync_every)
+        # row_id -> (values digest, [(file name, size), ...])
+        self.completed: dict[str, tuple[str, list[tuple[str, int]]]] = {}
+        self.failures: dict[str, int] = {}
+        self._file: io.TextIOWrapper | None = None
+        self._unsynced = 0
+
+    def open(self) -> BatchJournal:
+        """Load an existing journal for this run, then open it for appending."""
+        if self.path.exists():
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._append({"run": self.run_info})
+        return self
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            data = f.read()
+        # Drop a record torn by the crash so new records start on a fresh line
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+
+        lines = data[:end].decode("utf-8").splitlines()
+        header = json.loads(lines[0]).get("run") if lines else None
+        if header != self.run_info:
+            raise CardGeneratorError(
+                f"Journal {self.path} belongs to a different run "
+                "(template, output, color, font, --set or ID column settings "
+                "changed); "
+                "remove it or choose another --journal path"
+            )
+        for line in lines[1:]:
+            record = json.loads(line)
+            row_id = record["row_id"]
+            if record["status"] == "done":
+                self.completed[row_id] = (
+                    record["digest"],
+                    [tuple(output) for output in record["outputs"]],
+                )
+                self.failures.pop(row_id, None)
+            else:
+                self.failures[row_id] = self.failures.get(row_id, 0) + 1
+
+    def _append(self, record: dict[str, Any]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Make every record written so far durable."""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def record_done(
+        self, row_id: str, digest: str, outputs: list[tuple[str, int]]
+    ) -> None:
+        """Record a row whose files (name, size) have all been written."""
+        self._append(
+            {"row_id": row_id, "status": "done", "digest": digest, "outputs": outputs}
+        )
+        self.completed[row_id] = (digest, outputs)
+        self.failures.pop(row_id, None)
+
+    def record_failure(self, row_id: str, error: str) -> None:
+        self._append({"row_id": row_id, "status": "failed", "error": error})
+        self.failures[row_id] = self.failures.get(row_id, 0) + 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> BatchJournal:
+        return self.open()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+@dataclass
+class CheckpointSummary:
+    """Row counts of one checkpointed run."""
+
+    rendered: int = 0
+    skipped: int = 0
+    retried: int = 0
+    failed: list[str] = field(default_factory=list)
+
+
+class CheckpointedExecutor:
+    """
+    Renders a streamed roster into a directory, recording progress in a
+    BatchJournal so an interrupted run can be restarted where it stopped.
+
+    Rows already recorded as done are skipped as long as their values are
+    unchanged and their files are still present with the recorded sizes.
+    A row that raises is recorded as failed and retried, up to max_retries
+    retries counted across runs; rows that exhaust their retries are
+    reported and the batch carries on.
+    """
+
+    def __init__(
+        self, generator: CardGenerator, journal: BatchJournal, max_retries: int = 2
+    ):
+        self.generator = generator
+        self.journal = journal
+        self.max_retries = max(0, max_retries)
+
+    def _is_complete(self, sink: DirectorySink, row_id: str, digest: str) -> bool:
+        recorded = self.journal.completed.get(row_id)
+        if recorded is None or recorded[0] != digest:
+            return False
+        outputs = recorded[1]
+        directory = sink.output_path.parent
+        for name, size in outputs:
+            try:
+                if (directory / name).stat().st_size != size:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+
+    def _render_row(
+        self,
+        layout: dict[str, Any],
+        row_id: str,
+        placeholders: dict[str, str],
+        sink: DirectorySink,
+        base_path: Path | None,
+    ) -> list[tuple[str, int]]:
+        """Render, encode and write every side of a row; returns (name, size) pairs."""
+        encoded = [
+            (side_output_id(row_id, side_name), self.generator.encode(image))
+            for side_name, image in self.generator.render_sides(
+                layout, placeholders, base_path
+            )
+        ]
+        outputs = []
+        for output_id, data in encoded:
+            sink.write(output_id, data)
+            outputs.append((sink.path(output_id).name, len(data)))
+        return outputs
+
+    def run(
+        self,
+        layout: dict[str, Any],
+        rows: Iterable[tuple[str, dict[str, str]]],
+        sink: DirectorySink,
+        base_path: Path | None = None,
+    ) -> CheckpointSummary:
+        """Render rows not yet completed; rows are consumed one at a time."""
+        summary = CheckpointSummary()
+        attempts_allowed = self.max_retries + 1
+        for row_id, placeholders in rows:
+            digest = row_digest(placeholders)
+            if self._is_complete(sink, row_id, digest):
+                summary.skipped += 1
+                continue
+
+            previous_failures = self.journal.failures.get(row_id, 0)
+            while self.journal.failures.get(row_id, 0) < attempts_allowed:
+                try:
+                    outputs = self._render_row(
+                        layout, row_id, placeholders, sink, base_path
+                    )
+                except FontNotFoundError:
+                    # Configuration error: every row would fail the same way
+                    raise
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    print(f"Warning: Row {row_id or '-'} failed: {error}", file=sys.stderr)
+                    self.journal.record_failure(row_id, error)
+                    continue
+                self.journal.record_done(row_id, digest, outputs)
+                summary.rendered += 1
+                if previous_failures:
+                    summary.retried += 1
+                break
+            else:
+                summary.failed.append(row_id)
+
+        self.journal.sync()
+        print(
+            f"Checkpoint: {summary.rendered} rows rendered ({summary.retried} after "
+            f"retries), {summary.skipped} already done, {len(summary.failed)} failed",
+            file=sys.stderr,
+        )
+        if summary.failed:
+            print(
+                f"Failed rows (gave up after {attempts_allowed} attempts): "
+                + ", ".join(row_id or "-" for row_id in summary.failed),
+                file=sys.stderr,
+            )
+        return summary
 
 
 # ============================================================================
@@ -317,6 +1831,71 @@ def parse_set_args(set_args: list[str]) -> dict[str, str]:
     return result
 
 
+def run_preflight(
+    generator: CardGenerator,
+    layout: dict[str, Any],
+    rows: Iterable[tuple[str, dict[str, str]]],
+) -> int:
+    """Print missing glyphs per row; returns 1 if any were found."""
+    started = time.perf_counter()
+    row_count = 0
+    affected_rows: set[str] = set()
+
+    def counted(rows: Iterable[tuple[str, dict[str, str]]]):
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            yield row
+
+    for result in generator.preflight(layout, counted(rows)):
+        affected_rows.add(result.row_id)
+        print(result.format())
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Preflight: {len(affected_rows)} of {row_count} rows have missing glyphs "
+        f"({elapsed:.2f}s)",
+        file=sys.stderr,
+    )
+    return 1 if affected_rows else 0
+
+
+def run_checkpointed(
+    generator: CardGenerator,
+    layout: dict[str, Any],
+    rows: Iterable[tuple[str, dict[str, str]]],
+    args: argparse.Namespace,
+    base_path: Path,
+) -> int:
+    """Run a resumable batch journaled in args.journal; returns 1 if rows failed."""
+    if args.output.suffix.lower() in ARCHIVE_SINKS:
+        raise CardGeneratorError(
+            "--journal needs directory output; archives cannot be resumed after a crash"
+        )
+    if args.pipeline:
+        raise CardGeneratorError("--journal cannot be combined with --pipeline")
+
+    run_info = {
+        "template_sha256": hashlib.sha256(args.template.read_bytes()).hexdigest(),
+        "output": str(args.output),
+        "color_mode": generator.config.color_mode,
+        "icc_profile": str(args.icc_profile) if args.icc_profile else None,
+        "dpi": generator.config.dpi,
+        "font_paths": [str(path) for path in generator.config.font_paths],
+        "set": parse_set_args(args.set_args),
+        "id_column": args.id_column,
+    }
+    journal = BatchJournal(args.journal, run_info, args.journal_sync_every)
+    with journal, DirectorySink(args.output, generator.image_suffix) as sink:
+        executor = CheckpointedExecutor(generator, journal, args.max_retries)
+        summary = executor.run(layout, rows, sink, base_path)
+    return 1 if summary.failed else 0
+
+
+def _raise_keyboard_interrupt(signum: int, frame: object) -> None:
+    raise KeyboardInterrupt
+
+
 def main() -> int:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -324,7 +1903,12 @@ def main() -> int:
     )
     parser.add_argument("template", type=Path, help="JSON layout template")
     parser.add_argument(
-        "-o", "--output", type=Path, default=Path("output/card.png"), help="Output PNG file path"
+        "-o",
+        "--output",
+        type=Path,
+        default=Path("output/card.png"),
+        help="Output file path (.png, .tif with --color-mode cmyk, .pdf for vector output, "
+        "or .zip/.tar archive)",
     )
     parser.add_argument(
         "--set",
@@ -334,6 +1918,62 @@ def main() -> int:
         metavar='KEY="value"',
         help="Set placeholder value (can be used multiple times)",
     )
+    parser.add_argument(
+        "--roster",
+        type=Path,
+        help="CSV roster; one card per row, header names are placeholder keys",
+    )
+    parser.add_argument(
+        "--id-column",
+        help="Roster column used as the row ID in output names (default: row number)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap rendering, image encoding and writing in concurrent stages",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        help="Maximum items waiting between pipeline stages (default: 8)",
+    )
+    parser.add_argument(
+        "--encode-workers",
+        type=int,
+        help="Image encoder threads in pipeline mode (default: CPU count)",
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        help="Record completed rows in this file and resume from it when it exists "
+        "(directory output only)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=2,
+        help="Retries per failed row across resumed runs (default: 2)",
+    )
+    parser.add_argument(
+        "--journal-sync-every",
+        type=int,
+        default=64,
+        help="Journal records between fsync calls (default: 64)",
+    )
+    parser.add_argument(
+        "--preflight",
+        action="store_true",
+        help="Only check that the fonts cover every character; no images are rendered",
+    )
+    parser.add_argument(
+        "--color-mode",
+        choices=COLOR_MODES,
+        default="rgb",
+        help="rgb (PNG) or cmyk (print-ready TIFF/PDF; requires --icc-profile)",
+    )
+    parser.add_argument(
+        "--icc-profile", type=Path, help="Printer's CMYK ICC profile for --color-mode cmyk"
+    )
     parser.add_argument("--font-path", type=Path, help="Custom font directory path")
     parser.add_argument(
         "--dpi", type=int, default=300, help="Output resolution (default: 300)"
@@ -346,7 +1986,12 @@ def main() -> int:
     if args.font_path:
         font_paths.insert(0, args.font_path)
 
-    config = CardConfig(dpi=args.dpi, font_paths=font_paths)
+    config = CardConfig(
+        dpi=args.dpi,
+        font_paths=font_paths,
+        color_mode=args.color_mode,
+        icc_profile=args.icc_profile,
+    )
 
     # Generate
     try:
@@ -355,11 +2000,71 @@ def main() -> int:
         placeholders = parse_set_args(args.set_args)
         base_path = args.template.parent.resolve()
 
-        generator.render(layout, args.output, placeholders, base_path)
+        # Roster values override --set values, which act as defaults
+        if args.roster:
+            rows = (
+                (row_id, {**placeholders, **values})
+                for row_id, values in iter_roster(args.roster, args.id_column)
+            )
+        else:
+            rows = iter([("", placeholders)])
+
+        if args.preflight:
+            return run_preflight(generator, layout, rows)
+
+        if not args.pipeline and (
+            args.queue_depth is not None or args.encode_workers is not None
+        ):
+            raise CardGeneratorError("--queue-depth and --encode-workers need --pipeline")
+        if args.icc_profile and args.color_mode != "cmyk":
+            raise CardGeneratorError("--icc-profile needs --color-mode cmyk")
+
+        if args.output.suffix.lower() == ".pdf":
+            if args.journal:
+                raise CardGeneratorError(
+                    "--journal needs directory output; a .pdf is written in one piece "
+                    "at the end and cannot be resumed"
+                )
+            if args.pipeline:
+                raise CardGeneratorError(
+                    "--pipeline is not supported for .pdf output (pages go into one file)"
+                )
+            generator.render_pdf(
+                layout, args.output, (values for _, values in rows), base_path
+            )
+        else:
+            # Finalize archives on SIGTERM as well as Ctrl-C
+            signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+            suffix = args.output.suffix.lower()
+            if generator.color_transform and suffix == ".png":
+                raise CardGeneratorError("CMYK output must be .tif, .pdf, .zip or .tar")
+            if not generator.color_transform and suffix in (".tif", ".tiff"):
+                raise CardGeneratorError(
+                    "RGB output must be .png, .pdf, .zip or .tar "
+                    "(use --color-mode cmyk for TIFF)"
+                )
+            if args.journal:
+                return run_checkpointed(generator, layout, rows, args, base_path)
+            with open_sink(args.output, generator.image_suffix) as sink:
+                if args.pipeline:
+                    executor = PipelineExecutor(
+                        generator,
+                        8 if args.queue_depth is None else args.queue_depth,
+                        args.encode_workers,
+                    )
+                    executor.run(layout, rows, sink, base_path)
+                else:
+                    generator.render_to_sink(layout, rows, sink, base_path)
         return 0
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return 130
     except FontNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
+    except CardGeneratorError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
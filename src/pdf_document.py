@@ -0,0 +1,571 @@
+"""
+PDF Document Writer
+Minimal multi-page PDF writer used by the vector output backend.
+
+Text is written as real text with subsetted, embedded TrueType/OpenType
+fonts (Type0 / Identity-H), and images are embedded once as XObjects and
+shared by every page that references them. Image streams are written to
+the file as soon as they are added, so only fonts and page content are
+held until save().
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PIL import Image
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+
+# The subsetter reports every table it drops at WARNING level
+logging.getLogger("fontTools.subset").setLevel(logging.ERROR)
+
+
+class PdfError(Exception):
+    """Raised when a PDF document cannot be produced."""
+
+    pass
+
+
+MM_TO_PT = 72 / 25.4
+
+
+def _format_number(value: float) -> str:
+    """Format a number compactly for PDF content streams."""
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return text if text not in ("", "-0") else "0"
+
+
+def _pdf_string(text: str) -> str:
+    """Encode a PDF text string (UTF-16BE for non-ASCII text)."""
+    if not text.isascii():
+        return "<FEFF" + text.encode("utf-16-be").hex().upper() + ">"
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return f"({escaped})"
+
+
+def hex_to_rgb(color: str) -> tuple[float, float, float]:
+    """Convert a #RRGGBB color to PDF RGB components (0.0-1.0)."""
+    color = color.lstrip("#")
+    return tuple(int(color[i : i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def _fill_color(color: str | tuple[int, int, int, int]) -> str:
+    """Fill color operator for a #RRGGBB color or a CMYK tuple (0-255)."""
+    if isinstance(color, str):
+        components = hex_to_rgb(color)
+        operator = "rg"
+    else:
+        components = tuple(value / 255 for value in color)
+        operator = "k"
+    return " ".join(_format_number(value) for value in components) + f" {operator}"
+
+
+# ============================================================================
+# Fonts
+# ============================================================================
+
+
+class PdfFont:
+    """An embedded font; glyph usage is tracked so it can be subset on save."""
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = path
+        self._font = TTFont(str(path), lazy=True)
+        self.is_cff = "CFF " in self._font
+        if not self.is_cff and "glyf" not in self._font:
+            raise PdfError(f"Unsupported font outlines: {path}")
+
+        self.units_per_em = self._font["head"].unitsPerEm
+        self.ascent = self._font["hhea"].ascent
+        self.descent = self._font["hhea"].descent
+        self._cmap = self._font.getBestCmap() or {}
+        self._glyph_order = self._font.getGlyphOrder()
+        self._glyph_ids = {name: gid for gid, name in enumerate(self._glyph_order)}
+        self._metrics = self._font["hmtx"].metrics
+
+        # CID-keyed CFF fonts are addressed by CID, everything else by GID
+        self._cid_keyed = self.is_cff and hasattr(
+            self._font["CFF "].cff.topDictIndex[0], "ROS"
+        )
+        self.used: dict[int, str] = {}
+        self._used_glyphs: set[str] = {self._glyph_order[0]}
+
+    def _code(self, glyph_name: str) -> int:
+        if self._cid_keyed and glyph_name.startswith("cid"):
+            return int(glyph_name[3:])
+        return self._glyph_ids[glyph_name]
+
+    def encode(self, text: str) -> str:
+        """Encode text as a hex string of 2-byte codes, recording glyph usage."""
+        codes = []
+        notdef = self._glyph_order[0]
+        for char in text:
+            glyph_name = self._cmap.get(ord(char), notdef)
+            code = self._code(glyph_name)
+            # Every missing character shares the .notdef code, so it cannot
+            # map back to any one of them
+            self.used.setdefault(code, "\ufffd" if glyph_name == notdef else char)
+            self._used_glyphs.add(glyph_name)
+            codes.append(f"{code:04X}")
+        return "<" + "".join(codes) + ">"
+
+    def text_width(self, text: str, size: float) -> float:
+        """Advance width of text in points."""
+        total = 0
+        for char in text:
+            glyph_name = self._cmap.get(ord(char), self._glyph_order[0])
+            total += self._metrics[glyph_name][0]
+        return total * size / self.units_per_em
+
+    def ascent_at(self, size: float) -> float:
+        """Ascender height in points (matches Pillow's default "la" anchor)."""
+        return self.ascent * size / self.units_per_em
+
+    def _glyph_width(self, code: int) -> int:
+        glyph_name = f"cid{code:05d}" if self._cid_keyed else self._glyph_order[code]
+        advance = self._metrics.get(glyph_name, (0, 0))[0]
+        return round(advance * 1000 / self.units_per_em)
+
+    def _subset_program(self) -> bytes:
+        options = subset.Options()
+        options.retain_gids = not self._cid_keyed
+        options.notdef_outline = True
+        options.layout_features = []
+        options.hinting = False
+        options.desubroutinize = True
+        options.name_IDs = ["*"]
+
+        font = TTFont(str(self.path))
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(glyphs=sorted(self._used_glyphs))
+        subsetter.subset(font)
+
+        buffer = io.BytesIO()
+        font.save(buffer)
+        return buffer.getvalue()
+
+    def _base_font(self) -> str:
+        postscript_name = self._font["name"].getDebugName(6) or self.path.stem
+        postscript_name = "".join(c for c in postscript_name if c.isalnum() or c in "-_")
+        digest = hashlib.sha256(repr(sorted(self.used)).encode()).digest()
+        tag = "".join(chr(ord("A") + b % 26) for b in digest[:6])
+        return f"{tag}+{postscript_name}"
+
+    def _to_unicode_cmap(self) -> bytes:
+        lines = [
+            "/CIDInit /ProcSet findresource begin",
+            "12 dict begin",
+            "begincmap",
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+            "/CMapName /Adobe-Identity-UCS def",
+            "/CMapType 2 def",
+            "1 begincodespacerange",
+            "<0000> <FFFF>",
+            "endcodespacerange",
+        ]
+        items = sorted(self.used.items())
+        for start in range(0, len(items), 100):
+            chunk = items[start : start + 100]
+            lines.append(f"{len(chunk)} beginbfchar")
+            for code, char in chunk:
+                utf16 = char.encode("utf-16-be").hex().upper()
+                lines.append(f"<{code:04X}> <{utf16}>")
+            lines.append("endbfchar")
+        lines += ["endcmap", "CMapName currentdict /CMap defineresource pop", "end", "end"]
+        return "\n".join(lines).encode("ascii")
+
+    def write_objects(self, writer: _ObjectWriter, font_ref: int) -> None:
+        """Write the Type0 font and its descendants, using font_ref for the root."""
+        base_font = self._base_font()
+        head = self._font["head"]
+        scale = 1000 / self.units_per_em
+
+        program_ref = writer.add_stream(
+            self._subset_program(),
+            "/Subtype /OpenType" if self.is_cff else "",
+        )
+        descriptor_ref = writer.add(
+            f"<< /Type /FontDescriptor /FontName /{base_font} /Flags 4 "
+            f"/FontBBox [{round(head.xMin * scale)} {round(head.yMin * scale)} "
+            f"{round(head.xMax * scale)} {round(head.yMax * scale)}] "
+            f"/ItalicAngle 0 /Ascent {round(self.ascent * scale)} "
+            f"/Descent {round(self.descent * scale)} "
+            f"/CapHeight {round(self.ascent * scale)} /StemV 80 "
+            f"/{'FontFile3' if self.is_cff else 'FontFile2'} {program_ref} 0 R >>"
+        )
+
+        widths = " ".join(
+            f"{code} [{self._glyph_width(code)}]" for code in sorted(self.used)
+        )
+        subtype = "/CIDFontType0" if self.is_cff else "/CIDFontType2"
+        cid_to_gid = "" if self.is_cff else " /CIDToGIDMap /Identity"
+        descendant_ref = writer.add(
+            f"<< /Type /Font /Subtype {subtype} /BaseFont /{base_font} "
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor {descriptor_ref} 0 R /W [{widths}]{cid_to_gid} >>"
+        )
+        to_unicode_ref = writer.add_stream(self._to_unicode_cmap())
+        writer.add(
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{base_font} "
+            f"/Encoding /Identity-H /DescendantFonts [{descendant_ref} 0 R] "
+            f"/ToUnicode {to_unicode_ref} 0 R >>",
+            ref=font_ref,
+        )
+
+
+# ============================================================================
+# Images
+# ============================================================================
+
+
+@dataclass
+class PdfImage:
+    """An image XObject, embedded once and shared by every page."""
+
+    name: str
+    width: int
+    height: int
+    color_space: str
+    data: bytes
+    filter: str
+    smask: bytes | None = None
+
+    @classmethod
+    def from_file(cls, name: str, path: Path) -> PdfImage:
+        """Load an image file, passing baseline JPEG data through unchanged."""
+        with Image.open(path) as img:
+            if img.format == "JPEG" and img.mode in ("RGB", "L"):
+                color_space = "/DeviceRGB" if img.mode == "RGB" else "/DeviceGray"
+                return cls(
+                    name, img.width, img.height, color_space, path.read_bytes(), "/DCTDecode"
+                )
+            return cls.from_image(name, img)
+
+    @classmethod
+    def from_image(
+        cls, name: str, img: Image.Image, mask: Image.Image | None = None
+    ) -> PdfImage:
+        """Build an XObject from a decoded Pillow image and optional alpha mask."""
+        smask = zlib.compress(mask.convert("L").tobytes()) if mask is not None else None
+        if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+            img = img.convert("RGBA")
+            smask = zlib.compress(img.getchannel("A").tobytes())
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "L", "CMYK"):
+            img = img.convert("RGB")
+
+        color_space = {"RGB": "/DeviceRGB", "L": "/DeviceGray", "CMYK": "/DeviceCMYK"}
+        return cls(
+            name,
+            img.width,
+            img.height,
+            color_space[img.mode],
+            zlib.compress(img.tobytes()),
+            "/FlateDecode",
+            smask,
+        )
+
+    def write_objects(self, writer: _ObjectWriter, image_ref: int) -> None:
+        """Write the image (and its soft mask) using image_ref for the image."""
+        smask_entry = ""
+        if self.smask is not None:
+            smask_ref = writer.add_stream(
+                self.smask,
+                f"/Type /XObject /Subtype /Image /Width {self.width} "
+                f"/Height {self.height} /ColorSpace /DeviceGray /BitsPerComponent 8",
+                compress=False,
+                filter="/FlateDecode",
+            )
+            smask_entry = f" /SMask {smask_ref} 0 R"
+        writer.add_stream(
+            self.data,
+            f"/Type /XObject /Subtype /Image /Width {self.width} "
+            f"/Height {self.height} /ColorSpace {self.color_space} "
+            f"/BitsPerComponent 8{smask_entry}",
+            compress=False,
+            filter=self.filter,
+            ref=image_ref,
+        )
+
+
+@dataclass(frozen=True)
+class PdfImageRef:
+    """An image XObject already written to the file, drawn by name."""
+
+    name: str
+    width: int
+    height: int
+    ref: int
+
+
+# ============================================================================
+# Pages
+# ============================================================================
+
+
+@dataclass
+class PdfPage:
+    """A single page; y coordinates are measured from the top edge in points."""
+
+    width: float
+    height: float
+    operations: list[str] = field(default_factory=list)
+
+    def fill_rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        color: str | tuple[int, int, int, int],
+    ) -> None:
+        self.operations.append(
+            f"q {_fill_color(color)} "
+            f"{_format_number(x)} {_format_number(self.height - y - height)} "
+            f"{_format_number(width)} {_format_number(height)} re f Q"
+        )
+
+    def fill_cells(
+        self,
+        x: float,
+        y: float,
+        cell_size: float,
+        cells: list[tuple[int, int, int, int]],
+        color: str | tuple[int, int, int, int],
+    ) -> None:
+        """
+        Fill (column, row, columns, rows) rectangles of a grid whose top-left
+        corner is at (x, y), as a single path in grid units.
+        """
+        rects = " ".join(f"{col} {row} {w} {h} re" for col, row, w, h in cells)
+        self.operations.append(
+            f"q {_fill_color(color)} {_format_number(cell_size)} 0 0 "
+            f"{_format_number(-cell_size)} {_format_number(x)} "
+            f"{_format_number(self.height - y)} cm {rects} f Q"
+        )
+
+    def draw_image(
+        self, image: PdfImageRef, x: float, y: float, width: float, height: float
+    ) -> None:
+        self.operations.append(
+            f"q {_format_number(width)} 0 0 {_format_number(height)} "
+            f"{_format_number(x)} {_format_number(self.height - y - height)} cm "
+            f"/{image.name} Do Q"
+        )
+
+    def draw_text(
+        self,
+        font: PdfFont,
+        size: float,
+        x: float,
+        y: float,
+        text: str,
+        color: str | tuple[int, int, int, int],
+    ) -> None:
+        """Draw text with its ascender line at y (Pillow's "la" anchor)."""
+        baseline = self.height - y - font.ascent_at(size)
+        self.operations.append(
+            f"BT /{font.name} {_format_number(size)} Tf {_fill_color(color)} "
+            f"{_format_number(x)} {_format_number(baseline)} Td "
+            f"{font.encode(text)} Tj ET"
+        )
+
+
+# ============================================================================
+# Document
+# ============================================================================
+
+
+class _ObjectWriter:
+    """Serializes numbered PDF objects and the cross-reference table."""
+
+    def __init__(self, stream: io.BufferedIOBase):
+        self._stream = stream
+        self._offsets: dict[int, int] = {}
+        self._next_ref = 1
+        self._position = 0
+        self._write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes) -> None:
+        self._stream.write(data)
+        self._position += len(data)
+
+    def reserve(self) -> int:
+        ref = self._next_ref
+        self._next_ref += 1
+        return ref
+
+    def add(self, body: str | bytes, ref: int | None = None) -> int:
+        ref = ref or self.reserve()
+        if isinstance(body, str):
+            body = body.encode("latin-1")
+        self._offsets[ref] = self._position
+        self._write(f"{ref} 0 obj\n".encode() + body + b"\nendobj\n")
+        return ref
+
+    def add_stream(
+        self,
+        data: bytes,
+        dictionary: str = "",
+        compress: bool = True,
+        filter: str | None = None,
+        ref: int | None = None,
+    ) -> int:
+        if compress:
+            data = zlib.compress(data)
+            filter = "/FlateDecode"
+        entries = f"{dictionary} /Length {len(data)}".strip()
+        if filter:
+            entries += f" /Filter {filter}"
+        return self.add(f"<< {entries} >>\nstream\n".encode() + data + b"\nendstream", ref)
+
+    def finish(self, root_ref: int, info: str) -> None:
+        info_ref = self.add(info)
+        xref_position = self._position
+        size = self._next_ref
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for ref in range(1, size):
+            lines.append(f"{self._offsets[ref]:010d} 00000 n \n")
+        lines.append(
+            f"trailer\n<< /Size {size} /Root {root_ref} 0 R /Info {info_ref} 0 R >>\n"
+            f"startxref\n{xref_position}\n%%EOF\n"
+        )
+        self._write("".join(lines).encode("ascii"))
+
+
+class PdfDocument:
+    """A multi-page PDF with fonts and images shared across all pages."""
+
+    def __init__(self, output_path: Path, title: str = ""):
+        self.output_path = output_path
+        self.title = title
+        # CMYK ICC profile written as the document's output intent
+        self.output_intent: bytes | None = None
+        self.pages: list[PdfPage] = []
+        self._fonts: dict[Path, PdfFont] = {}
+        self._images: dict[object, PdfImageRef] = {}
+        self._file: io.BufferedWriter | None = None
+        self._writer: _ObjectWriter | None = None
+
+    def _open_writer(self) -> _ObjectWriter:
+        """Open the output file on first use, reserving the fixed objects."""
+        if self._writer is None:
+            self._file = open(self.output_path, "wb")
+            self._writer = _ObjectWriter(self._file)
+            self._root_ref = self._writer.reserve()
+            self._pages_ref = self._writer.reserve()
+            self._resources_ref = self._writer.reserve()
+        return self._writer
+
+    def _embed(self, key: object, image: PdfImage) -> PdfImageRef:
+        """Write an image stream now and keep only its name, size and ref."""
+        writer = self._open_writer()
+        ref = writer.reserve()
+        image.write_objects(writer, ref)
+        self._images[key] = PdfImageRef(image.name, image.width, image.height, ref)
+        return self._images[key]
+
+    def get_font(self, path: Path) -> PdfFont:
+        """Get the embedded font for a font file, registering it on first use."""
+        if path not in self._fonts:
+            self._fonts[path] = PdfFont(f"F{len(self._fonts) + 1}", path)
+        return self._fonts[path]
+
+    def get_image(self, key: object, path: Path | None = None) -> PdfImageRef | None:
+        """Get a shared image by key, loading and writing it from path on first use."""
+        if key not in self._images and path is not None:
+            self._embed(key, PdfImage.from_file(f"Im{len(self._images) + 1}", path))
+        return self._images.get(key)
+
+    def add_image(
+        self, key: object, img: Image.Image, mask: Image.Image | None = None
+    ) -> PdfImageRef:
+        """Register and write a decoded image under key (no-op if already present)."""
+        if key not in self._images:
+            self._embed(
+                key, PdfImage.from_image(f"Im{len(self._images) + 1}", img, mask)
+            )
+        return self._images[key]
+
+    def new_page(self, width_mm: float, height_mm: float) -> PdfPage:
+        """Append a new page of the given size."""
+        page = PdfPage(width_mm * MM_TO_PT, height_mm * MM_TO_PT)
+        self.pages.append(page)
+        return page
+
+    def close(self) -> None:
+        """Discard an unfinished file (no-op after save)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.output_path.unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """Finish the document, subsetting every font to the glyphs used."""
+        if not self.pages:
+            self.close()
+            raise PdfError("Cannot write a PDF without pages")
+
+        try:
+            writer = self._open_writer()
+            font_refs = {font.name: writer.reserve() for font in self._fonts.values()}
+
+            page_refs = []
+            for page in self.pages:
+                content_ref = writer.add_stream("\n".join(page.operations).encode("latin-1"))
+                page_refs.append(
+                    writer.add(
+                        f"<< /Type /Page /Parent {self._pages_ref} 0 R "
+                        f"/MediaBox [0 0 {_format_number(page.width)} "
+                        f"{_format_number(page.height)}] "
+                        f"/Resources {self._resources_ref} 0 R /Contents {content_ref} 0 R >>"
+                    )
+                )
+
+            for font in self._fonts.values():
+                font.write_objects(writer, font_refs[font.name])
+
+            fonts = " ".join(f"/{name} {ref} 0 R" for name, ref in font_refs.items())
+            images = " ".join(
+                f"/{image.name} {image.ref} 0 R" for image in self._images.values()
+            )
+            writer.add(
+                f"<< /Font << {fonts} >> /XObject << {images} >> "
+                "/ProcSet [/PDF /Text /ImageB /ImageC] >>",
+                ref=self._resources_ref,
+            )
+            kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+            writer.add(
+                f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>",
+                ref=self._pages_ref,
+            )
+            output_intents = ""
+            if self.output_intent is not None:
+                profile_ref = writer.add_stream(self.output_intent, "/N 4")
+                output_intents = (
+                    " /OutputIntents [<< /Type /OutputIntent /S /GTS_PDFX "
+                    "/OutputConditionIdentifier (Custom) "
+                    f"/DestOutputProfile {profile_ref} 0 R >>]"
+                )
+            writer.add(
+                f"<< /Type /Catalog /Pages {self._pages_ref} 0 R{output_intents} >>",
+                ref=self._root_ref,
+            )
+            writer.finish(
+                self._root_ref,
+                f"<< /Title {_pdf_string(self.title)} /Producer (generator.py) >>",
+            )
+        except BaseException:
+            self.close()
+            raise
+        self._file.close()
+        self._file = None
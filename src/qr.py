@@ -0,0 +1,407 @@
+"""
+QR Code Encoder
+Pure-Python QR Code (ISO/IEC 18004) encoder used by the qrcode element.
+
+Payloads are encoded in byte mode as UTF-8 at the smallest version that fits
+the requested error correction level. The result is the module matrix only;
+drawing (and the quiet zone) is left to the renderers.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+
+class QrCodeError(Exception):
+    """Raised when a payload cannot be encoded as a QR code."""
+
+    pass
+
+
+ERROR_CORRECTION_LEVELS = ("L", "M", "Q", "H")
+
+# Format information bits for each error correction level
+_FORMAT_BITS = {"L": 1, "M": 0, "Q": 3, "H": 2}
+
+# Error correction codewords per block, indexed by version (index 0 unused)
+_ECC_CODEWORDS_PER_BLOCK = {
+    "L": (
+        0, 7, 10, 15, 20, 26, 18, 20, 24, 30, 18, 20, 24, 26,
+        30, 22, 24, 28, 30, 28, 28, 28, 28, 30, 30, 26, 28, 30,
+        30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30,
+    ),
+    "M": (
+        0, 10, 16, 26, 18, 24, 16, 18, 22, 22, 26, 30, 22, 22,
+        24, 24, 28, 28, 26, 26, 26, 26, 28, 28, 28, 28, 28, 28,
+        28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28,
+    ),
+    "Q": (
+        0, 13, 22, 18, 26, 18, 24, 18, 22, 20, 24, 28, 26, 24,
+        20, 30, 24, 28, 28, 26, 30, 28, 30, 30, 30, 30, 28, 30,
+        30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30,
+    ),
+    "H": (
+        0, 17, 28, 22, 16, 22, 28, 26, 26, 24, 28, 24, 28, 22,
+        24, 24, 30, 28, 28, 26, 28, 30, 24, 30, 30, 30, 30, 30,
+        30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30,
+    ),
+}
+
+# Error correction blocks, indexed by version (index 0 unused)
+_ECC_BLOCKS = {
+    "L": (
+        0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 4, 4, 4, 4,
+        4, 6, 6, 6, 6, 7, 8, 8, 9, 9, 10, 12, 12, 12,
+        13, 14, 15, 16, 17, 18, 19, 19, 20, 21, 22, 24, 25,
+    ),
+    "M": (
+        0, 1, 1, 1, 2, 2, 4, 4, 4, 5, 5, 5, 8, 9,
+        9, 10, 10, 11, 13, 14, 16, 17, 17, 18, 20, 21, 23, 25,
+        26, 28, 29, 31, 33, 35, 37, 38, 40, 43, 45, 47, 49,
+    ),
+    "Q": (
+        0, 1, 1, 2, 2, 4, 4, 6, 6, 8, 8, 8, 10, 12,
+        16, 12, 17, 16, 18, 21, 20, 23, 23, 25, 27, 29, 34, 34,
+        35, 38, 40, 43, 45, 48, 51, 53, 56, 59, 62, 65, 68,
+    ),
+    "H": (
+        0, 1, 1, 2, 4, 4, 4, 5, 6, 8, 8, 11, 11, 16,
+        16, 18, 16, 19, 21, 25, 25, 25, 34, 30, 32, 35, 37, 40,
+        42, 45, 48, 51, 54, 57, 60, 63, 66, 70, 74, 77, 81,
+    ),
+}
+
+# Data masks as functions of (row, column)
+_MASKS = (
+    lambda r, c: (r + c) % 2 == 0,
+    lambda r, c: r % 2 == 0,
+    lambda r, c: c % 3 == 0,
+    lambda r, c: (r + c) % 3 == 0,
+    lambda r, c: (r // 2 + c // 3) % 2 == 0,
+    lambda r, c: r * c % 2 + r * c % 3 == 0,
+    lambda r, c: (r * c % 2 + r * c % 3) % 2 == 0,
+    lambda r, c: ((r + c) % 2 + r * c % 3) % 2 == 0,
+)
+
+# Finder-like 1:1:3:1:1 pattern with four light modules on either side
+# (neither can overlap itself, so str.count finds every occurrence)
+_FINDER_LIKE = ("10111010000", "00001011101")
+_LONG_RUN = re.compile(r"0{5,}|1{5,}")
+
+
+# ============================================================================
+# Reed-Solomon Error Correction
+# ============================================================================
+
+_GF_EXP = [0] * 512
+_GF_LOG = [0] * 256
+_value = 1
+for _power in range(255):
+    _GF_EXP[_power] = _value
+    _GF_LOG[_value] = _power
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11D
+for _power in range(255, 512):
+    _GF_EXP[_power] = _GF_EXP[_power - 255]
+
+
+@lru_cache(maxsize=None)
+def _rs_generator(degree: int) -> tuple[int, ...]:
+    """Coefficients of the generator polynomial (x - a^0)...(x - a^(degree-1))."""
+    poly = [1]
+    for power in range(degree):
+        poly = [
+            high ^ (_GF_EXP[_GF_LOG[low] + power] if low else 0)
+            for high, low in zip(poly + [0], [0] + poly)
+        ]
+    return tuple(poly[1:])
+
+
+def _rs_remainder(data: bytes, degree: int) -> bytes:
+    """Error correction codewords for one block of data codewords."""
+    generator = [_GF_LOG[coefficient] for coefficient in _rs_generator(degree)]
+    remainder = [0] * degree
+    for byte in data:
+        factor = byte ^ remainder.pop(0)
+        remainder.append(0)
+        if factor:
+            log_factor = _GF_LOG[factor]
+            for i, log_coefficient in enumerate(generator):
+                remainder[i] ^= _GF_EXP[log_coefficient + log_factor]
+    return bytes(remainder)
+
+
+# ============================================================================
+# Version Layout
+# ============================================================================
+
+
+def _alignment_positions(version: int) -> list[int]:
+    if version == 1:
+        return []
+    count = version // 7 + 2
+    step = 26 if version == 32 else (version * 4 + count * 2 + 1) // (count * 2 - 2) * 2
+    last = version * 4 + 10
+    return [6] + [last - i * step for i in reversed(range(count - 1))]
+
+
+def _raw_data_modules(version: int) -> int:
+    """Number of modules available for codewords (data + ECC + remainder)."""
+    result = (16 * version + 128) * version + 64
+    if version >= 2:
+        count = version // 7 + 2
+        result -= (25 * count - 10) * count - 55
+        if version >= 7:
+            result -= 36
+    return result
+
+
+def _data_codewords(version: int, level: str) -> int:
+    return (
+        _raw_data_modules(version) // 8
+        - _ECC_CODEWORDS_PER_BLOCK[level][version] * _ECC_BLOCKS[level][version]
+    )
+
+
+def _bch_bits(value: int, generator: int, degree: int) -> int:
+    remainder = value
+    for _ in range(degree):
+        remainder = (remainder << 1) ^ ((remainder >> (degree - 1)) * generator)
+    return value << degree | remainder
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+
+def _encode_data(payload: bytes, level: str) -> tuple[int, bytes]:
+    """Choose the smallest version and return it with the padded data codewords."""
+    for version in range(1, 41):
+        count_bits = 8 if version <= 9 else 16
+        capacity = _data_codewords(version, level) * 8
+        if 4 + count_bits + len(payload) * 8 <= capacity:
+            break
+    else:
+        raise QrCodeError(
+            f"Payload too long for a QR code at level {level}: {len(payload)} bytes"
+        )
+
+    bits = f"0100{len(payload):0{count_bits}b}" + "".join(f"{b:08b}" for b in payload)
+    bits += "0" * min(4, capacity - len(bits))
+    bits += "0" * (-len(bits) % 8)
+    data = bytearray(int(bits[i : i + 8], 2) for i in range(0, len(bits), 8))
+    pad = (0xEC, 0x11)
+    for i in range(capacity // 8 - len(data)):
+        data.append(pad[i % 2])
+    return version, bytes(data)
+
+
+def _interleave(data: bytes, version: int, level: str) -> bytes:
+    """Split data into blocks, append ECC and interleave the codewords."""
+    block_count = _ECC_BLOCKS[level][version]
+    ecc_length = _ECC_CODEWORDS_PER_BLOCK[level][version]
+    raw_codewords = _raw_data_modules(version) // 8
+    short_blocks = block_count - raw_codewords % block_count
+    short_length = raw_codewords // block_count - ecc_length
+
+    blocks = []
+    position = 0
+    for i in range(block_count):
+        length = short_length + (i >= short_blocks)
+        blocks.append(data[position : position + length])
+        position += length
+    eccs = [_rs_remainder(block, ecc_length) for block in blocks]
+
+    result = bytearray()
+    for i in range(short_length + 1):
+        result.extend(block[i] for block in blocks if i < len(block))
+    for i in range(ecc_length):
+        result.extend(ecc[i] for ecc in eccs)
+    return bytes(result)
+
+
+class _Matrix:
+    """Function patterns of one version, tracking which modules they occupy."""
+
+    def __init__(self, version: int):
+        self.size = version * 4 + 17
+        self.dark = [[False] * self.size for _ in range(self.size)]
+        self.function = [[False] * self.size for _ in range(self.size)]
+
+    def set_function(self, row: int, col: int, dark: bool) -> None:
+        self.dark[row][col] = dark
+        self.function[row][col] = True
+
+    def draw_function_patterns(self, version: int) -> None:
+        size = self.size
+        for i in range(size):
+            self.set_function(6, i, i % 2 == 0)
+            self.set_function(i, 6, i % 2 == 0)
+
+        for row, col in ((3, 3), (3, size - 4), (size - 4, 3)):
+            for dr in range(-4, 5):
+                for dc in range(-4, 5):
+                    if 0 <= row + dr < size and 0 <= col + dc < size:
+                        distance = max(abs(dr), abs(dc))
+                        self.set_function(row + dr, col + dc, distance not in (2, 4))
+
+        positions = _alignment_positions(version)
+        last = len(positions) - 1
+        for i, row in enumerate(positions):
+            for j, col in enumerate(positions):
+                if (i, j) in ((0, 0), (0, last), (last, 0)):
+                    continue
+                for dr in range(-2, 3):
+                    for dc in range(-2, 3):
+                        distance = max(abs(dr), abs(dc))
+                        self.set_function(row + dr, col + dc, distance != 1)
+
+        # Reserve format areas light; the bits are set once the mask is chosen
+        for copies in zip(*_format_positions(size)):
+            for row, col in copies:
+                self.set_function(row, col, False)
+        self.set_function(size - 8, 8, True)
+
+        if version >= 7:
+            bits = _bch_bits(version, 0x1F25, 12)
+            for i in range(18):
+                dark = bool(bits >> i & 1)
+                a, b = size - 11 + i % 3, i // 3
+                self.set_function(b, a, dark)
+                self.set_function(a, b, dark)
+
+    def codeword_positions(self) -> list[tuple[int, int]]:
+        """Data modules in the two-column zigzag placement order."""
+        size = self.size
+        positions = []
+        right = size - 1
+        while right >= 1:
+            if right == 6:
+                right = 5
+            upward = ((right + 1) & 2) == 0
+            for vertical in range(size):
+                row = size - 1 - vertical if upward else vertical
+                for col in (right, right - 1):
+                    if not self.function[row][col]:
+                        positions.append((row, col))
+            right -= 2
+        return positions
+
+
+def _row_bits(grid: list[list[bool]]) -> tuple[int, ...]:
+    """Rows as integers, leftmost module in the most significant bit."""
+    return tuple(int("".join("1" if dark else "0" for dark in row), 2) for row in grid)
+
+
+def _format_positions(size: int) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+    """(row, col) of format bits 0-14 in the top-left copy and in the split copy."""
+    first = [(i, 8) for i in range(6)] + [(7, 8), (8, 8), (8, 7)]
+    first += [(8, 14 - i) for i in range(9, 15)]
+    second = [(8, size - 1 - i) for i in range(8)]
+    second += [(size - 15 + i, 8) for i in range(8, 15)]
+    return first, second
+
+
+@lru_cache(maxsize=None)
+def _version_layout(
+    version: int,
+) -> tuple[tuple[int, ...], tuple[int, ...], tuple[tuple[int, int], ...]]:
+    """
+    Function-pattern rows, data-module rows and codeword placement for a version.
+
+    Everything but the codewords depends only on the version, so it is built
+    once and each payload only sets its data bits.
+    """
+    matrix = _Matrix(version)
+    matrix.draw_function_patterns(version)
+    size = matrix.size
+    data = tuple(~row for row in _row_bits(matrix.function))
+    placement = tuple(
+        (row, 1 << (size - 1 - col)) for row, col in matrix.codeword_positions()
+    )
+    return _row_bits(matrix.dark), data, placement
+
+
+@lru_cache(maxsize=None)
+def _mask_bits(mask: int, size: int) -> tuple[int, ...]:
+    """Mask pattern rows as integers for a symbol size."""
+    pattern = _MASKS[mask]
+    return tuple(
+        sum(1 << (size - 1 - c) for c in range(size) if pattern(r, c))
+        for r in range(size)
+    )
+
+
+def _penalty(rows: list[str]) -> int:
+    """Mask penalty score (ISO/IEC 18004 section 7.8.3)."""
+    size = len(rows)
+    columns = ["".join(column) for column in zip(*rows)]
+    # Scan every row and column at once; "|" keeps matches within one line
+    lines = "|".join(rows + columns)
+    padded = "|".join(f"0000{line}0000" for line in rows + columns)
+
+    # Runs of five or more same-colored modules
+    runs = _LONG_RUN.findall(lines)
+    score = sum(map(len, runs)) - 2 * len(runs)
+    # Finder-like patterns
+    score += 40 * sum(padded.count(pattern) for pattern in _FINDER_LIKE)
+
+    # 2x2 blocks of one color
+    values = [int(row, 2) for row in rows]
+    low_bits = (1 << (size - 1)) - 1
+    for upper, lower in zip(values, values[1:]):
+        same = ~(upper ^ lower) & ~(upper ^ upper >> 1) & ~(lower ^ lower >> 1)
+        score += 3 * bin(same & low_bits).count("1")
+
+    # Balance of dark and light modules
+    dark = sum(row.count("1") for row in rows)
+    total = size * size
+    score += 10 * ((abs(dark * 20 - total * 10) + total - 1) // total - 1)
+    return score
+
+
+@lru_cache(maxsize=4096)
+def qr_matrix(payload: str, error_correction: str = "M") -> tuple[str, ...]:
+    """
+    Encode payload and return the module matrix, one "0"/"1" string per row.
+
+    Matrices are cached by payload, so every side and output format of a card
+    shares one encoding.
+    """
+    if error_correction not in ERROR_CORRECTION_LEVELS:
+        raise QrCodeError(f"Unknown error correction level: {error_correction}")
+
+    version, data = _encode_data(payload.encode("utf-8"), error_correction)
+    function_rows, data_rows, placement = _version_layout(version)
+    size = version * 4 + 17
+
+    dark = list(function_rows)
+    codewords = _interleave(data, version, error_correction)
+    for (row, bit), value in zip(placement, "".join(f"{b:08b}" for b in codewords)):
+        if value == "1":
+            dark[row] |= bit
+
+    # Masks only touch data modules, so each candidate is a few integer ops per row
+    format_positions = list(zip(*_format_positions(size)))
+    best_rows, best_score = None, None
+    for mask in range(len(_MASKS)):
+        bits = [
+            row ^ (pattern & data_row)
+            for row, pattern, data_row in zip(dark, _mask_bits(mask, size), data_rows)
+        ]
+        format_bits = (
+            _bch_bits(_FORMAT_BITS[error_correction] << 3 | mask, 0x537, 10) ^ 0x5412
+        )
+        for i, copies in enumerate(format_positions):
+            if format_bits >> i & 1:
+                for row, col in copies:
+                    bits[row] |= 1 << (size - 1 - col)
+
+        rows = [f"{row:0{size}b}" for row in bits]
+        score = _penalty(rows)
+        if best_score is None or score < best_score:
+            best_rows, best_score = rows, score
+    return tuple(best_rows)